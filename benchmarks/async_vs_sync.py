@@ -0,0 +1,111 @@
+"""
+Compare the WSGI (DRF) and the native ASGI read paths of the events API.
+
+Serve the same project twice with the same server, once per interface:
+
+    uvicorn --interface wsgi --port 8000 tikoProject.wsgi:application
+    uvicorn --port 8001 tikoProject.asgi:application
+
+and run:
+
+    python -m benchmarks.async_vs_sync --username <user> \
+        --sync-url http://127.0.0.1:8000/api/events/ \
+        --async-url http://127.0.0.1:8001/api/async/events/
+
+Both targets are loaded with the same number of concurrent connections for the
+same duration, the requests per second and latency percentiles are printed as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urljoin
+
+import httpx
+
+
+def percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def login(base_url: str, username: str) -> dict:
+    async with httpx.AsyncClient() as client:
+        response = await client.post(
+            urljoin(base_url, "/api/auth/login/"), data={"username": username}
+        )
+        response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_load(url: str, headers: dict, concurrency: int, duration: float) -> dict:
+    """Request `url` from `concurrency` connections in a closed loop for `duration`s.
+
+    Args:
+        url (str): URL to request.
+        headers (dict): Headers sent with every request.
+        concurrency (int): Number of concurrent connections.
+        duration (float): Length of the measurement in seconds.
+
+    Returns:
+        dict: Request and error counts, requests per second and latency percentiles.
+    """
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url, headers=headers)
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "url": url,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+async def main(args):
+    headers = await login(args.sync_url, args.username)
+    results = {}
+    for name, url in (("wsgi", args.sync_url), ("asgi", args.async_url)):
+        await run_load(url, headers, args.concurrency, args.warmup)
+        results[name] = await run_load(url, headers, args.concurrency, args.duration)
+    if results["wsgi"]["rps"]:
+        results["asgi_rps_ratio"] = round(
+            results["asgi"]["rps"] / results["wsgi"]["rps"], 2
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sync-url", default="http://127.0.0.1:8000/api/events/")
+    parser.add_argument(
+        "--async-url", default="http://127.0.0.1:8001/api/async/events/"
+    )
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,175 @@
+"""
+Compare the full-text search of events with `icontains` substring matches.
+
+    python -m benchmarks.event_search --rows 1000000
+
+Fills a scratch SQLite database with events whose names and descriptions are drawn
+from a Zipf distributed vocabulary, then builds the FTS5 index of `events.search`.
+Every query is run the way the events list runs it: the FTS5 variant returns the
+first page ordered by rank, or newest first if the words match more than
+`SEARCH_RANK_LIMIT` events, the baseline filters every word with
+`name LIKE %word% OR description LIKE %word%` and orders by start date, as
+`icontains` does. Index build time, database size and per-query latency
+percentiles are printed as JSON.
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from events.search import (CREATE_SEARCH_INDEX, REBUILD_SEARCH_INDEX,
+                           SEARCH_TABLE, build_match_query)
+
+# Default of the `SEARCH_RANK_LIMIT` setting.
+SEARCH_RANK_LIMIT = 10_000
+
+SCHEMA = """
+CREATE TABLE events_event (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    start_date TEXT NOT NULL
+);
+CREATE INDEX event_start_date_idx ON events_event (start_date, id);
+"""
+
+PAGE_SIZE = 50
+
+
+def percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def make_vocabulary(rng: random.Random, size: int) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(letters, k=rng.randint(3, 10))))
+    return sorted(words)
+
+
+def fill(conn: sqlite3.Connection, rows: int, vocabulary: list[str], seed: int):
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    cumulative, total = [], 0.0
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+
+    def events():
+        for event_id in range(1, rows + 1):
+            words = rng.choices(vocabulary, cum_weights=cumulative, k=33)
+            yield (
+                event_id,
+                " ".join(words[:3]),
+                " ".join(words[3:]),
+                f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            )
+
+    conn.executemany("INSERT INTO events_event VALUES (?, ?, ?, ?)", events())
+    conn.commit()
+
+
+def fts_query(conn: sqlite3.Connection, text: str) -> list:
+    query = build_match_query(text)
+    broad = conn.execute(
+        f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH ? "
+        "LIMIT 1 OFFSET ?",
+        (query, SEARCH_RANK_LIMIT),
+    ).fetchall()
+    ordering = "s.rowid DESC" if broad else "s.rank, e.id"
+    return conn.execute(
+        f"SELECT e.id FROM events_event e JOIN {SEARCH_TABLE} s ON e.id = s.rowid "
+        f"WHERE s.{SEARCH_TABLE} MATCH ? ORDER BY {ordering} LIMIT ?",
+        (query, PAGE_SIZE),
+    ).fetchall()
+
+
+def icontains_query(conn: sqlite3.Connection, text: str) -> list:
+    words = text.split()
+    condition = " AND ".join(
+        "(name LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')" for _ in words
+    )
+    params = [f"%{word}%" for word in words for _ in range(2)]
+    return conn.execute(
+        f"SELECT id FROM events_event WHERE {condition} "
+        "ORDER BY start_date, id LIMIT ?",
+        (*params, PAGE_SIZE),
+    ).fetchall()
+
+
+def measure(conn: sqlite3.Connection, query, text: str, repeat: int) -> dict:
+    latencies, matches = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        matches = len(query(conn, text))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        "matches": matches,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+    }
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng, args.vocabulary)
+    # Frequent, mid-frequency and rare words, a prefix, a single letter and two
+    # words combined.
+    queries = {
+        "common word": vocabulary[0],
+        "mid word": vocabulary[len(vocabulary) // 20],
+        "rare word": vocabulary[-1],
+        "prefix": vocabulary[len(vocabulary) // 20][:3],
+        "one letter": vocabulary[0][0],
+        "two words": f"{vocabulary[1]} {vocabulary[len(vocabulary) // 50]}",
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.sqlite3")
+        conn = sqlite3.connect(path)
+        conn.executescript(SCHEMA)
+        fill(conn, args.rows, vocabulary, args.seed)
+        started = time.perf_counter()
+        for statement in CREATE_SEARCH_INDEX:
+            conn.execute(statement)
+        conn.execute(REBUILD_SEARCH_INDEX)
+        conn.commit()
+        build_seconds = time.perf_counter() - started
+
+        results = {}
+        for name, text in queries.items():
+            results[name] = {
+                "text": text,
+                "fts5": measure(conn, fts_query, text, args.repeat),
+                "icontains": measure(conn, icontains_query, text, args.repeat),
+            }
+        conn.close()
+        size = os.path.getsize(path)
+
+    print(
+        json.dumps(
+            {
+                "rows": args.rows,
+                "index_build_seconds": round(build_seconds, 2),
+                "database_mb": round(size / 2**20, 1),
+                "queries": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
@@ -0,0 +1,75 @@
+"""
+Compare the sign and verify throughput of the JWT algorithms.
+
+    python -m benchmarks.jwt_algorithms --tokens 20000
+
+Signs access-token shaped payloads with every algorithm and verifies them again, as
+`TokenService` does. RS256 is included as a reference, the key ring supports HS256
+and the asymmetric EdDSA and ES256. Operations per second and token sizes are
+printed as JSON.
+"""
+
+import argparse
+import datetime
+import json
+import time
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from tokens_auth.keys import ASYMMETRIC_ALGORITHMS
+
+
+def keys(algorithm: str) -> tuple[object, object]:
+    """Return the signing and the verification key of an algorithm."""
+    if algorithm == "HS256":
+        secret = "benchmark-secret-key-of-32-bytes!"
+        return secret, secret
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        private_key = ASYMMETRIC_ALGORITHMS[algorithm][0]()
+    return private_key, private_key.public_key()
+
+
+def run(algorithm: str, tokens: int) -> dict:
+    signing_key, verification_key = keys(algorithm)
+    payload = {
+        "user_id": 42,
+        "exp": datetime.datetime.now(datetime.UTC) + datetime.timedelta(hours=1),
+        "iat": datetime.datetime.now(datetime.UTC),
+        "type": "access",
+    }
+    headers = None if algorithm == "HS256" else {"kid": "20240101000000"}
+
+    started = time.perf_counter()
+    encoded = [
+        jwt.encode(payload, signing_key, algorithm=algorithm, headers=headers)
+        for _ in range(tokens)
+    ]
+    sign_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for token in encoded:
+        jwt.decode(token, verification_key, algorithms=[algorithm])
+    verify_elapsed = time.perf_counter() - started
+
+    return {
+        "sign_per_second": round(tokens / sign_elapsed),
+        "verify_per_second": round(tokens / verify_elapsed),
+        "token_bytes": len(encoded[0]),
+    }
+
+
+def main(args):
+    results = {algorithm: run(algorithm, args.tokens) for algorithm in args.algorithms}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tokens", type=int, default=20000)
+    parser.add_argument(
+        "--algorithms", nargs="+", default=["HS256", "EdDSA", "ES256", "RS256"]
+    )
+    main(parser.parse_args())
@@ -0,0 +1,239 @@
+"""
+Drive a mixed workload against a running server and report throughput and latency
+percentiles per endpoint.
+
+Seed a database and serve it, e.g.:
+
+    python manage.py seed_events --users 1000 --events 10000 --seed 1
+    SERVER_MODE=wsgi ./run.sh
+
+and run:
+
+    python -m benchmarks.loadtest --base-url http://127.0.0.1:8000 \
+        --concurrency 50 --duration 60 --output baseline.json
+
+Every virtual user logs in as one of the seeded users and then picks requests at
+random by the weights of `WORKLOAD`: event lists with random `EventFilter`
+parameters, event details, registrations and unregistrations, token refreshes and
+logins. The JSON report holds the requests per second and p50/p95/p99 latencies per
+endpoint, to be compared between releases.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+WORKLOAD = {
+    "list": 50,
+    "detail": 25,
+    "register": 8,
+    "unregister": 7,
+    "refresh": 5,
+    "login": 5,
+}
+
+
+def percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def list_params(rng: random.Random, owner_ids: list[int]) -> dict:
+    """Build a random combination of the event list filters."""
+    params = {}
+    if rng.random() < 0.5:
+        params["status"] = rng.choice(["past", "future"])
+    if rng.random() < 0.2:
+        params["available"] = rng.choice(["true", "false"])
+    if owner_ids and rng.random() < 0.2:
+        params["owner"] = rng.choice(owner_ids)
+    if rng.random() < 0.2:
+        params["ordering"] = rng.choice(
+            ["start_date", "-start_date", "-attendee_count"]
+        )
+    return params
+
+
+class VirtualUser:
+    """One simulated client with its own tokens, running requests in a closed loop.
+
+    Unregistrations target the events the user registered for during the run.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, username: str, rng: random.Random):
+        self.client = client
+        self.username = username
+        self.rng = rng
+        self.access_token = None
+        self.refresh_token = None
+        self.registered = set()
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    async def login(self) -> httpx.Response:
+        response = await self.client.post(
+            "/api/auth/login/", data={"username": self.username}
+        )
+        if response.status_code == 200:
+            self.store_tokens(response.json())
+        return response
+
+    async def refresh(self) -> httpx.Response:
+        response = await self.client.post(
+            "/api/auth/refresh-token/", data={"refresh_token": self.refresh_token}
+        )
+        if response.status_code == 200:
+            self.store_tokens(response.json())
+        return response
+
+    def store_tokens(self, tokens: dict):
+        self.access_token = tokens["access_token"]
+        self.refresh_token = tokens["refresh_token"]
+
+    async def request(self, endpoint: str, event_ids: list, owner_ids: list):
+        if endpoint == "login":
+            return await self.login()
+        if endpoint == "refresh":
+            return await self.refresh()
+        if endpoint == "list":
+            return await self.client.get(
+                "/api/events/",
+                params=list_params(self.rng, owner_ids),
+                headers=self.headers,
+            )
+        if endpoint == "unregister" and self.registered:
+            event_id = self.rng.choice(sorted(self.registered))
+        else:
+            event_id = self.rng.choice(event_ids)
+        if endpoint == "detail":
+            return await self.client.get(
+                f"/api/events/{event_id}/", headers=self.headers
+            )
+        register = endpoint == "register"
+        response = await self.client.post(
+            f"/api/events/{event_id}/register/",
+            json={"register": register},
+            headers=self.headers,
+        )
+        if response.status_code == 200:
+            if register:
+                self.registered.add(event_id)
+            else:
+                self.registered.discard(event_id)
+        return response
+
+
+async def discover_events(client: httpx.AsyncClient, headers: dict, pages: int):
+    """Collect event and owner IDs from the first pages of the future events."""
+    event_ids, owner_ids = [], set()
+    url, params = "/api/events/", {"status": "future", "page_size": 100}
+    for _ in range(pages):
+        response = await client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        event_ids.extend(event["id"] for event in data["results"])
+        owner_ids.update(event["owner"] for event in data["results"])
+        if not data["next"]:
+            break
+        url, params = data["next"], None
+    return event_ids, sorted(owner_ids)
+
+
+async def main(args) -> dict:
+    rng = random.Random(args.seed)
+    endpoints, weights = zip(*WORKLOAD.items())
+    latencies = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=60
+    ) as client:
+        users = [
+            VirtualUser(
+                client,
+                f"{args.prefix}{rng.randrange(args.users)}",
+                random.Random(rng.random()),
+            )
+            for _ in range(args.concurrency)
+        ]
+        for user in users:
+            (await user.login()).raise_for_status()
+        event_ids, owner_ids = await discover_events(
+            client, users[0].headers, args.discover_pages
+        )
+        if not event_ids:
+            raise SystemExit("No future events found, seed the database first.")
+
+        async def run(user: VirtualUser, deadline: float, record: bool):
+            while time.perf_counter() < deadline:
+                endpoint = user.rng.choices(endpoints, weights=weights)[0]
+                started = time.perf_counter()
+                try:
+                    response = await user.request(endpoint, event_ids, owner_ids)
+                    status = str(response.status_code)
+                except httpx.HTTPError as error:
+                    status = type(error).__name__
+                if record:
+                    latencies[endpoint].append((time.perf_counter() - started) * 1000)
+                    statuses[endpoint][status] += 1
+
+        warmup_deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(*(run(user, warmup_deadline, False) for user in users))
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(run(user, deadline, True) for user in users))
+        elapsed = time.perf_counter() - started
+
+    report = {
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 1),
+        "requests": sum(len(values) for values in latencies.values()),
+        "rps": round(sum(len(values) for values in latencies.values()) / elapsed, 1),
+        "endpoints": {
+            endpoint: {
+                "requests": len(latencies[endpoint]),
+                "rps": round(len(latencies[endpoint]) / elapsed, 1),
+                "p50_ms": round(percentile(latencies[endpoint], 50), 2),
+                "p95_ms": round(percentile(latencies[endpoint], 95), 2),
+                "p99_ms": round(percentile(latencies[endpoint], 99), 2),
+                "statuses": dict(sorted(statuses[endpoint].items())),
+            }
+            for endpoint in endpoints
+        },
+    }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument(
+        "--users", type=int, default=1000, help="Number of seeded users to log in as."
+    )
+    parser.add_argument(
+        "--prefix", default="loadtest", help="Username prefix used by seed_events."
+    )
+    parser.add_argument("--discover-pages", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="File to write the JSON report to.")
+    args = parser.parse_args()
+    output = json.dumps(asyncio.run(main(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    print(output)
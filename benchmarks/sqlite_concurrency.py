@@ -0,0 +1,168 @@
+"""
+Compare SQLite write throughput under concurrent writers with and without the
+connection tuning from `settings.DATABASES`.
+
+    python -m benchmarks.sqlite_concurrency --threads 16 --duration 10
+
+Every thread opens its own connection to a scratch database and runs registration
+shaped transactions in a closed loop: read the event, bump its attendee counter and
+insert an attendee row. The baseline uses SQLite's defaults (rollback journal,
+deferred transactions), the tuned run applies the pragmas, busy timeout and
+transaction mode of the project settings. Committed transactions per second,
+"database is locked" errors and latency percentiles are printed as JSON.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import django
+from django.conf import settings
+
+SCHEMA = """
+CREATE TABLE event (id INTEGER PRIMARY KEY, attendee_count INTEGER NOT NULL);
+CREATE TABLE attendee (
+    id INTEGER PRIMARY KEY, event_id INTEGER NOT NULL, user_id INTEGER NOT NULL
+);
+"""
+
+
+def percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def tuned_config() -> dict:
+    options = settings.DATABASES["default"]["OPTIONS"]
+    return {
+        "init_commands": [
+            command for command in options["init_command"].split(";") if command
+        ],
+        "timeout": options["timeout"],
+        "begin": f"BEGIN {options['transaction_mode']}",
+    }
+
+
+def baseline_config() -> dict:
+    # The previous Django defaults: rollback journal, deferred transactions and
+    # the 5 second busy timeout of the sqlite3 module.
+    return {"init_commands": [], "timeout": 5.0, "begin": "BEGIN"}
+
+
+def run(config: dict, threads: int, duration: float, events: int) -> dict:
+    """Run the write workload against a fresh database file.
+
+    Args:
+        config (dict): Connection setup: init commands, busy timeout in seconds and
+            the statement starting a transaction.
+        threads (int): Number of concurrent writers, each with its own connection.
+        duration (float): Length of the measurement in seconds.
+        events (int): Number of events the writers spread their registrations over.
+
+    Returns:
+        dict: Commit and error counts, commits per second and latency percentiles.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.sqlite3")
+        setup = sqlite3.connect(path)
+        setup.executescript(SCHEMA)
+        setup.executemany(
+            "INSERT INTO event (id, attendee_count) VALUES (?, 0)",
+            [(event_id,) for event_id in range(1, events + 1)],
+        )
+        setup.commit()
+        setup.close()
+
+        latencies, errors = [], 0
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def writer(user_id: int):
+            nonlocal errors
+            conn = sqlite3.connect(
+                path,
+                timeout=config["timeout"],
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            for command in config["init_commands"]:
+                conn.execute(command)
+            iteration = 0
+            while time.perf_counter() < deadline:
+                event_id = (user_id + iteration) % events + 1
+                iteration += 1
+                started = time.perf_counter()
+                try:
+                    conn.execute(config["begin"])
+                    conn.execute(
+                        "SELECT attendee_count FROM event WHERE id = ?", (event_id,)
+                    ).fetchone()
+                    conn.execute(
+                        "UPDATE event SET attendee_count = attendee_count + 1 "
+                        "WHERE id = ?",
+                        (event_id,),
+                    )
+                    conn.execute(
+                        "INSERT INTO attendee (event_id, user_id) VALUES (?, ?)",
+                        (event_id, user_id),
+                    )
+                    conn.execute("COMMIT")
+                except sqlite3.OperationalError:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    with lock:
+                        errors += 1
+                    continue
+                with lock:
+                    latencies.append((time.perf_counter() - started) * 1000)
+            conn.close()
+
+        workers = [
+            threading.Thread(target=writer, args=(user_id,))
+            for user_id in range(threads)
+        ]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+    return {
+        "commits": len(latencies),
+        "errors": errors,
+        "commits_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def main(args):
+    results = {
+        name: run(config, args.threads, args.duration, args.events)
+        for name, config in (("baseline", baseline_config()), ("tuned", tuned_config()))
+    }
+    if results["baseline"]["commits_per_second"]:
+        results["tuned_throughput_ratio"] = round(
+            results["tuned"]["commits_per_second"]
+            / results["baseline"]["commits_per_second"],
+            2,
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tikoProject.settings")
+    django.setup()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--events", type=int, default=100)
+    main(parser.parse_args())
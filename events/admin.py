@@ -5,4 +5,4 @@ from events.models import Event
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    pass
+    readonly_fields = ("attendee_count",)
@@ -0,0 +1,15 @@
+from django.urls import path
+from django.views.decorators.csrf import csrf_exempt
+
+from events.async_views import (AsyncEventDetailView, AsyncEventListView,
+                                AsyncEventRegisterView)
+
+urlpatterns = [
+    path("", AsyncEventListView.as_view(), name="async-event-list"),
+    path("<int:pk>/", AsyncEventDetailView.as_view(), name="async-event-detail"),
+    path(
+        "<int:pk>/register/",
+        csrf_exempt(AsyncEventRegisterView.as_view()),
+        name="async-event-register",
+    ),
+]
@@ -0,0 +1,130 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from django.http import JsonResponse
+from django.views import View
+from rest_framework.exceptions import (AuthenticationFailed, NotFound,
+                                       ValidationError)
+from rest_framework.request import Request
+
+from events.filters import EventFilter
+from events.models import Event
+from events.pagination import KeysetPagination
+from events.serializers import (CompactEventSerializer,
+                                EventRegistrationSerializer,
+                                ReadEventSerializer)
+from events.utils import handle_event_registration
+from tokens_auth.permissions import HasValidAccessToken
+
+
+def with_attendee_ids(queryset):
+    User = get_user_model()
+    return queryset.prefetch_related(
+        Prefetch("attendees", queryset=User.objects.only("id"))
+    )
+
+
+class AsyncEventView(View):
+    """
+    Base class for the native async event endpoints served under ASGI.
+    Checks the access token with the async variant of `HasValidAccessToken`.
+    """
+
+    permission = HasValidAccessToken()
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.permission.ahas_permission(request, self)
+        except AuthenticationFailed as e:
+            return JsonResponse({"detail": e.detail}, status=e.status_code)
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncEventListView(AsyncEventView):
+    """Async counterpart of `EventViewSet.list`, with the same filters and pagination.
+
+    Unlike `EventViewSet`, the list cache and conditional GET are not applied.
+    """
+
+    # A search adds one query, counting its matches up to `SEARCH_RANK_LIMIT`.
+    query_budget = 4
+
+    async def get(self, request):
+        filterset = EventFilter(request.GET, queryset=Event.objects.all())
+        if not filterset.is_valid():
+            return JsonResponse(filterset.errors, status=400)
+
+        expand = request.GET.get("expand") == "attendees"
+        # A search counts its matches while filtering, which needs a sync connection.
+        queryset = await sync_to_async(lambda: filterset.qs)()
+        if expand:
+            queryset = with_attendee_ids(queryset)
+        paginator = KeysetPagination()
+        try:
+            page_queryset = paginator.get_page_queryset(queryset, Request(request))
+        except NotFound as e:
+            return JsonResponse({"detail": e.detail}, status=e.status_code)
+        page = paginator.finalize_page([event async for event in page_queryset])
+
+        serializer_class = ReadEventSerializer if expand else CompactEventSerializer
+        return JsonResponse(
+            {
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "results": serializer_class(page, many=True).data,
+            }
+        )
+
+
+class AsyncEventDetailView(AsyncEventView):
+    """Async counterpart of `EventViewSet.retrieve`."""
+
+    query_budget = 3
+
+    async def get(self, request, pk):
+        expand = request.GET.get("expand") == "attendees"
+        queryset = with_attendee_ids(Event.objects.all()) if expand else Event.objects
+        try:
+            event = await queryset.aget(pk=pk)
+        except Event.DoesNotExist:
+            return JsonResponse(
+                {"detail": "No Event matches the given query."}, status=404
+            )
+        serializer_class = ReadEventSerializer if expand else CompactEventSerializer
+        return JsonResponse(serializer_class(event).data)
+
+
+class AsyncEventRegisterView(AsyncEventView):
+    """Async counterpart of `EventViewSet.register`."""
+
+    query_budget = 4
+
+    async def post(self, request, pk):
+        try:
+            event = await Event.objects.aget(pk=pk)
+        except Event.DoesNotExist:
+            return JsonResponse({"error": "Event not found"}, status=404)
+
+        if request.content_type == "application/json":
+            try:
+                data = json.loads(request.body)
+            except ValueError:
+                return JsonResponse({"detail": "JSON parse error"}, status=400)
+        else:
+            data = request.POST
+        serializer = EventRegistrationSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=400)
+
+        try:
+            # The guarded write runs in a transaction, which needs a sync connection.
+            message = await sync_to_async(handle_event_registration)(
+                event=event,
+                user=request.user,
+                register=serializer.validated_data["register"],
+            )
+        except ValidationError as e:
+            return JsonResponse({"message": e.detail}, status=400)
+        return JsonResponse({"message": message})
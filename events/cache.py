@@ -0,0 +1,195 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+from monitoring.metrics import EVENT_LIST_CACHE_REQUESTS
+
+ALL_EVENTS = "all"
+EPOCH = "epoch"
+
+
+class EventListCache:
+    """Cache of serialized event list pages, keyed by the normalized query parameters.
+
+    Entries are never deleted. Each key embeds generations that writes replace
+    instead: lists filtered by owner depend on that owner's generation, all other
+    lists on the generation of all events. A write therefore only invalidates the
+    lists it can affect, without scanning keys.
+
+    Generations are unique values, the time they were set in nanoseconds, never
+    counters. A generation evicted from the cache is replaced by a new value, so
+    the entries stored under the old one cannot be served again, and concurrent
+    writes cannot lose an update the way a non-atomic increment can.
+    """
+
+    prefix = "events:list"
+    max_tracked_keys = 1000
+
+    def __init__(self):
+        self._stats: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[settings.EVENTS_LIST_CACHE_ALIAS]
+
+    @property
+    def timeout(self) -> int:
+        return int(settings.EVENTS_LIST_CACHE_TIMEOUT)
+
+    def make_key(self, query_params) -> tuple[str, str]:
+        """Build the cache key and the stats label of a list request.
+
+        Args:
+            query_params (QueryDict): Query parameters of the request.
+
+        Returns:
+            tuple[str, str]: Cache key including the generations the list depends on,
+                and a label of the filter parameters without the cursor.
+        """
+        params = sorted(
+            (name, value)
+            for name, values in query_params.lists()
+            for value in values
+            if value != ""
+        )
+        label = "&".join(
+            f"{name}={value}" for name, value in params if name != "cursor"
+        )
+        owners = [value for name, value in params if name == "owner"]
+        if owners:
+            scopes = [EPOCH] + [f"owner:{owner}" for owner in owners]
+        else:
+            scopes = [ALL_EVENTS]
+        generation = ".".join(str(value) for value in self.get_generations(scopes))
+        digest = hashlib.sha1(repr(params).encode()).hexdigest()
+        return f"{self.prefix}:{generation}:{digest}", label or "-"
+
+    def get_generations(self, scopes: list[str]) -> list[int]:
+        keys = [f"{self.prefix}:gen:{scope}" for scope in scopes]
+        generations = self.cache.get_many(keys)
+        for key in keys:
+            if key not in generations:
+                generation = time.time_ns()
+                if not self.cache.add(key, generation, timeout=None):
+                    generation = self.cache.get(key, generation)
+                generations[key] = generation
+        return [generations[key] for key in keys]
+
+    def get(self, query_params) -> tuple[Optional[str], Optional[dict]]:
+        """Look up the cached entry of a list request.
+
+        The key is computed before the list is read from the database, so an entry
+        stored under it after a concurrent write can never be served again.
+
+        Args:
+            query_params (QueryDict): Query parameters of the request.
+
+        Returns:
+            tuple[Optional[str], Optional[dict]]: The key to store a fresh entry under
+                and the cached entry, or None on a miss. The key is None if caching
+                is disabled.
+        """
+        if self.timeout <= 0:
+            return None, None
+        key, label = self.make_key(query_params)
+        entry = self.cache.get(key)
+        self.record(label, hit=entry is not None)
+        EVENT_LIST_CACHE_REQUESTS.labels(
+            "owner" if query_params.get("owner") else ALL_EVENTS,
+            "hit" if entry is not None else "miss",
+        ).inc()
+        return key, entry
+
+    def set(self, key: str, entry: dict) -> None:
+        self.cache.set(key, entry, timeout=self.timeout)
+
+    def invalidate(self, owner_ids: Optional[Iterable[int]] = None) -> None:
+        """Replace the generations of the lists affected by a write.
+
+        Args:
+            owner_ids (Optional[Iterable[int]]): Owners of the changed events. If
+                unknown, every owner-filtered list is invalidated as well.
+        """
+        scopes = [ALL_EVENTS]
+        if owner_ids is None:
+            scopes.append(EPOCH)
+        else:
+            scopes.extend(f"owner:{owner_id}" for owner_id in set(owner_ids))
+        generation = time.time_ns()
+        self.cache.set_many(
+            {f"{self.prefix}:gen:{scope}": generation for scope in scopes},
+            timeout=None,
+        )
+
+    def last_deletion(self) -> int:
+        """Return the time of the last deletion of an event, in nanoseconds.
+
+        Lists cannot see a deleted event in their own rows, so their validators
+        include this time. If it is unknown, e.g. evicted from the cache, the
+        current time is stored instead, which only costs a spurious change.
+        """
+        key = f"{self.prefix}:deleted"
+        deleted = self.cache.get(key)
+        if deleted is None:
+            deleted = time.time_ns()
+            if not self.cache.add(key, deleted, timeout=None):
+                deleted = self.cache.get(key, deleted)
+        return deleted
+
+    def record_deletion(self) -> None:
+        self.cache.set(f"{self.prefix}:deleted", time.time_ns(), timeout=None)
+
+    def record(self, label: str, hit: bool) -> None:
+        with self._lock:
+            stats = self._stats.pop(label, None) or {"hits": 0, "misses": 0}
+            stats["hits" if hit else "misses"] += 1
+            self._stats[label] = stats
+            while len(self._stats) > self.max_tracked_keys:
+                self._stats.popitem(last=False)
+
+    def stats(self) -> dict[str, dict]:
+        """Return hit/miss counters per filter combination, most recent last."""
+        with self._lock:
+            return {label: dict(stats) for label, stats in self._stats.items()}
+
+    def clear_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+event_list_cache = EventListCache()
+
+
+def invalidate_event_lists(owner_ids: Optional[Iterable[int]] = None) -> None:
+    """Invalidate cached event lists after a write to events or their attendees.
+
+    The generations are bumped right away and again once the surrounding transaction
+    commits, so a list cached from not yet committed data is dropped as well.
+
+    Args:
+        owner_ids (Optional[Iterable[int]]): Owners of the changed events, if known.
+    """
+    if owner_ids is not None:
+        owner_ids = list(owner_ids)
+    event_list_cache.invalidate(owner_ids)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: event_list_cache.invalidate(owner_ids))
+
+
+def record_event_deletion() -> None:
+    """Change the validators of every event list after an event was deleted.
+
+    Like `invalidate_event_lists`, the deletion time is stored right away and again
+    once the surrounding transaction commits.
+    """
+    event_list_cache.record_deletion()
+    if connection.in_atomic_block:
+        transaction.on_commit(event_list_cache.record_deletion)
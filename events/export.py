@@ -0,0 +1,115 @@
+import csv
+import json
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable, Iterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+from events.models import Event
+
+EXPORT_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "start_date",
+    "end_date",
+    "owner_id",
+    "capacity",
+    "attendee_count",
+    "updated_at",
+)
+
+
+def iter_event_chunks(
+    queryset: QuerySet, chunk_size: int = 0
+) -> Iterator[list[dict]]:
+    """Iterate over the events of a queryset in chunks, with their attendee IDs.
+
+    Every chunk is fetched with a keyset query on the primary key, and its
+    attendees with one query on the attendees table, so memory is bounded by the
+    chunk size and every query stays short, however many events are exported.
+
+    Args:
+        queryset (QuerySet): Filtered events to export. Its ordering is replaced
+            by the primary key.
+        chunk_size (int): Number of events per chunk, `EXPORT_CHUNK_SIZE` if 0.
+
+    Yields:
+        list[dict]: Events of the chunk as `EXPORT_FIELDS` plus `attendees`.
+    """
+    chunk_size = chunk_size or int(settings.EXPORT_CHUNK_SIZE)
+    queryset = queryset.order_by("pk").values(*EXPORT_FIELDS)
+    Attendee = Event.attendees.through
+    last_id = 0
+    while True:
+        events = list(queryset.filter(pk__gt=last_id)[:chunk_size])
+        if not events:
+            return
+        attendees = defaultdict(list)
+        for event_id, user_id in (
+            Attendee.objects.filter(event_id__in=[event["id"] for event in events])
+            .order_by("event_id", "user_id")
+            .values_list("event_id", "user_id")
+        ):
+            attendees[event_id].append(user_id)
+        for event in events:
+            event["attendees"] = attendees[event["id"]]
+        yield events
+        if len(events) < chunk_size:
+            return
+        last_id = events[-1]["id"]
+
+
+def render_ndjson(chunks: Iterable[list[dict]]) -> Iterator[str]:
+    """Render every chunk of events as newline delimited JSON objects."""
+    for events in chunks:
+        yield "".join(
+            json.dumps(event, cls=DjangoJSONEncoder, separators=(",", ":")) + "\n"
+            for event in events
+        )
+
+
+class _Buffer:
+    """File-like object handing the CSV writer's output back to the caller."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def render_csv(chunks: Iterable[list[dict]]) -> Iterator[str]:
+    """Render every chunk of events as CSV rows, after a header row.
+
+    Attendee IDs are joined with spaces into a single column.
+    """
+    writer = csv.writer(_Buffer())
+    yield writer.writerow((*EXPORT_FIELDS, "attendees"))
+    for events in chunks:
+        yield "".join(
+            writer.writerow(
+                (
+                    *(event[field] for field in EXPORT_FIELDS),
+                    " ".join(map(str, event["attendees"])),
+                )
+            )
+            for event in events
+        )
+
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", render_ndjson),
+    "csv": ("text/csv", render_csv),
+}
+
+
+async def aiter_export(content: Iterator[str]) -> AsyncIterator[str]:
+    """Pull an export chunk by chunk in the thread that runs the ORM.
+
+    Under ASGI a synchronous streaming response would be read to the end before
+    the first byte is sent, so exports are served through this iterator instead.
+    """
+    done = object()
+    while (chunk := await sync_to_async(next)(content, done)) is not done:
+        yield chunk
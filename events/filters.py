@@ -3,6 +3,8 @@ from django.utils import timezone
 from django_filters import rest_framework
 
 from events.models import Event
+from events.search import search_events
+from events.utils import has_free_places
 
 
 class EventStatus(models.TextChoices):
@@ -19,10 +21,18 @@ class EventFilter(rest_framework.FilterSet):
         method="filter_by_status",
         choices=EventStatus.choices,
     )
+    available = rest_framework.BooleanFilter(method="filter_by_availability")
+
+    ordering = rest_framework.OrderingFilter(
+        fields=(("start_date", "start_date"), ("attendee_count", "attendee_count"))
+    )
+    # Declared after `ordering`, so search results are ranked, or listed newest
+    # first for broad queries, unless an ordering is requested.
+    q = rest_framework.CharFilter(method="search")
 
     class Meta:
         model = Event
-        fields = ["start_date", "end_date", "status", "owner"]
+        fields = ["start_date", "end_date", "status", "owner", "available", "q"]
 
     def filter_by_status(self, queryset, name, value):
         today = timezone.now().date()
@@ -32,3 +42,20 @@ class EventFilter(rest_framework.FilterSet):
             filtered_queryset = queryset.filter(start_date__gt=today)
             return filtered_queryset
         return queryset
+
+    def filter_by_availability(self, queryset, name, value):
+        if value is None:
+            return queryset
+        if value:
+            return queryset.filter(has_free_places())
+        return queryset.exclude(has_free_places())
+
+    def search(self, queryset, name, value):
+        queryset = search_events(queryset, value)
+        if self.data.get("ordering"):
+            return queryset
+        if "search_rank" in queryset.query.annotations:
+            return queryset.order_by("search_rank")
+        if "search_id" in queryset.query.annotations:
+            return queryset.order_by("-search_id")
+        return queryset
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from events.export import EXPORT_FORMATS, iter_event_chunks
+from events.filters import EventFilter
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream all events with their attendee IDs as newline delimited JSON or CSV, "
+        "in constant memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=list(EXPORT_FORMATS), default="ndjson"
+        )
+        parser.add_argument(
+            "--output", help="File to write the export to, standard output if omitted."
+        )
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="Filter of the events list, e.g. `status=future`. Can be repeated.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=0,
+            help="Events fetched per query, `EXPORT_CHUNK_SIZE` by default.",
+        )
+
+    def handle(self, *args, **options):
+        filters = QueryDict(mutable=True)
+        for item in options["filter"]:
+            name, separator, value = item.partition("=")
+            if not separator:
+                raise CommandError(f"Invalid filter {item!r}, expected NAME=VALUE.")
+            filters.appendlist(name, value)
+        filterset = EventFilter(filters, queryset=Event.objects.all())
+        if not filterset.is_valid():
+            raise CommandError(filterset.errors.as_text())
+
+        _, render = EXPORT_FORMATS[options["format"]]
+        content = render(iter_event_chunks(filterset.qs, options["chunk_size"]))
+        if options["output"] is None:
+            for chunk in content:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", newline="", encoding="utf-8") as output:
+            output.writelines(content)
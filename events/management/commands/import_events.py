@@ -0,0 +1,239 @@
+import csv
+import json
+import time
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from events.cache import invalidate_event_lists
+from events.models import Event, ImportProgress
+from events.serializers import EventSerializer
+from events.utils import CAPACITY_MESSAGE, OWNER_MESSAGE
+
+User = get_user_model()
+Attendee = Event.attendees.through
+
+# Keeps the `IN (...)` lookups of a batch below SQLite's bound parameter limit.
+LOOKUP_CHUNK_SIZE = 900
+
+
+def read_rows(path: Path, input_format: str) -> Iterator[tuple[int, dict]]:
+    """Stream the rows of a JSONL or CSV file with their line numbers.
+
+    Empty CSV cells are read as missing values.
+    """
+    with path.open(newline="", encoding="utf-8") as file:
+        if input_format == "jsonl":
+            for line_number, line in enumerate(file, start=1):
+                if line.strip():
+                    yield line_number, json.loads(line)
+        else:
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, {
+                    field: value for field, value in row.items() if value != ""
+                }
+
+
+def parse_references(row: dict, id_field: str, username_field: str) -> list:
+    """Collect the user IDs and usernames a row refers to in one of its fields.
+
+    In JSON the fields hold a single value or a list, in CSV values separated by
+    spaces. IDs are returned as integers, usernames as strings.
+    """
+    references = []
+    for field, convert in ((id_field, int), (username_field, str)):
+        values = row.get(field)
+        if values is None:
+            continue
+        if isinstance(values, str):
+            values = values.split()
+        elif not isinstance(values, list):
+            values = [values]
+        try:
+            references.extend(convert(value) for value in values)
+        except (TypeError, ValueError):
+            raise ValidationError({field: "Invalid user reference."})
+    return references
+
+
+def chunked(values: Iterable, size: int) -> Iterator[list]:
+    values = iter(values)
+    while chunk := list(islice(values, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Import events with their attendees from a JSONL or CSV file in batches. "
+        "An interrupted import resumes after the last committed batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", type=Path)
+        parser.add_argument(
+            "--format",
+            choices=["jsonl", "csv"],
+            help="Format of the input, guessed from the file extension if omitted.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--source",
+            help="Name the progress is recorded under, the input's path by default.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["input"]
+        if not path.is_file():
+            raise CommandError(f"Input file {path} does not exist.")
+        input_format = options["format"] or (
+            "csv" if path.suffix.lower() == ".csv" else "jsonl"
+        )
+        progress, _ = ImportProgress.objects.get_or_create(
+            source=options["source"] or str(path.resolve())
+        )
+        if progress.rows:
+            self.stdout.write(f"Resuming after {progress.rows} rows.")
+
+        started, resumed = time.perf_counter(), progress.rows
+        imported = rejected = 0
+        rows = islice(read_rows(path, input_format), progress.rows, None)
+        try:
+            for batch in chunked(rows, options["batch_size"]):
+                batch_imported, batch_rejected = self.import_batch(
+                    batch, options["batch_size"], progress
+                )
+                imported += batch_imported
+                rejected += batch_rejected
+                if options["verbosity"] > 1:
+                    self.report(progress.rows, resumed, imported, rejected, started)
+        except json.JSONDecodeError as e:
+            raise CommandError(f"Invalid JSON after row {progress.rows}: {e}")
+        finally:
+            invalidate_event_lists()
+
+        progress.delete()
+        self.report(
+            progress.rows,
+            resumed,
+            imported,
+            rejected,
+            started,
+            style=self.style.SUCCESS,
+        )
+
+    def import_batch(
+        self, batch: list[tuple[int, dict]], batch_size: int, progress: ImportProgress
+    ) -> tuple:
+        """Validate a batch of rows and insert its valid events in one transaction.
+
+        The progress of the import is advanced in the same transaction, so a batch
+        is never committed without it and never imported twice.
+
+        Args:
+            batch (list[tuple[int, dict]]): Rows with their line numbers.
+            batch_size (int): Number of rows per `INSERT` statement.
+            progress (ImportProgress): Progress of the import.
+
+        Returns:
+            tuple[int, int]: Numbers of imported and rejected events.
+        """
+        validator = EventSerializer()
+        candidates, rejections = [], []
+        for line_number, row in batch:
+            try:
+                attrs = validator.run_validation(row)
+                owner = parse_references(row, "owner_id", "owner")
+                if len(owner) != 1:
+                    raise ValidationError({"owner": "Exactly one owner is required."})
+                attendees = parse_references(row, "attendees", "attendee_usernames")
+            except ValidationError as e:
+                rejections.append((line_number, e.detail))
+                continue
+            candidates.append((line_number, attrs, owner[0], attendees))
+
+        user_ids = self.resolve_users(
+            reference
+            for _, _, owner, attendees in candidates
+            for reference in (owner, *attendees)
+        )
+
+        events, attendee_ids = [], []
+        for line_number, attrs, owner, attendees in candidates:
+            unknown = [ref for ref in (owner, *attendees) if ref not in user_ids]
+            owner_id = user_ids.get(owner)
+            attendees = list(
+                dict.fromkeys(user_ids[ref] for ref in attendees if ref in user_ids)
+            )
+            if unknown:
+                rejections.append((line_number, f"Unknown users: {unknown}"))
+            elif owner_id in attendees:
+                rejections.append((line_number, OWNER_MESSAGE))
+            elif attrs.get("capacity") is not None and attrs["capacity"] < len(
+                attendees
+            ):
+                rejections.append((line_number, CAPACITY_MESSAGE))
+            else:
+                events.append(
+                    Event(**attrs, owner_id=owner_id, attendee_count=len(attendees))
+                )
+                attendee_ids.append(attendees)
+
+        with transaction.atomic():
+            events = Event.objects.bulk_create(events, batch_size=batch_size)
+            Attendee.objects.bulk_create(
+                (
+                    Attendee(event_id=event.pk, user_id=user_id)
+                    for event, users in zip(events, attendee_ids)
+                    for user_id in users
+                ),
+                batch_size=batch_size,
+            )
+            progress.rows += len(batch)
+            progress.save(update_fields=["rows"])
+        for line_number, errors in sorted(rejections, key=lambda item: item[0]):
+            self.stderr.write(f"Line {line_number}: {errors}")
+        return len(events), len(rejections)
+
+    @staticmethod
+    def resolve_users(references: Iterable) -> dict:
+        """Map user IDs and usernames to the IDs of existing users.
+
+        Args:
+            references (Iterable): User IDs (int) and usernames (str).
+
+        Returns:
+            dict: The ID of every reference that matches a user.
+        """
+        ids, usernames = set(), set()
+        for reference in references:
+            (ids if isinstance(reference, int) else usernames).add(reference)
+        resolved = {}
+        for chunk in chunked(ids, LOOKUP_CHUNK_SIZE):
+            resolved.update(
+                (user_id, user_id)
+                for user_id in User.objects.filter(pk__in=chunk).values_list(
+                    "pk", flat=True
+                )
+            )
+        for chunk in chunked(usernames, LOOKUP_CHUNK_SIZE):
+            resolved.update(
+                User.objects.filter(username__in=chunk).values_list("username", "pk")
+            )
+        return resolved
+
+    def report(
+        self, processed, resumed, imported, rejected, started, style=None
+    ) -> None:
+        elapsed = time.perf_counter() - started
+        rate = (processed - resumed) / elapsed if elapsed else 0
+        message = (
+            f"{processed} rows processed, {imported} events imported, "
+            f"{rejected} rejected in {elapsed:.1f}s ({rate:.0f} rows/s)."
+        )
+        self.stdout.write(style(message) if style else message)
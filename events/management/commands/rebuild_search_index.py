@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from events.models import Event
+from events.search import (CREATE_SEARCH_INDEX, REBUILD_SEARCH_INDEX,
+                           SEARCH_TABLE)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the full-text index of events from the events table and restore "
+        "its triggers, e.g. after a migration rebuilt the table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--optimize",
+            action="store_true",
+            help="Merge the index segments into one after rebuilding.",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "sqlite":
+            raise CommandError("The full-text index is only available on SQLite.")
+
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            for statement in CREATE_SEARCH_INDEX:
+                cursor.execute(statement)
+            cursor.execute(REBUILD_SEARCH_INDEX)
+            if options["optimize"]:
+                cursor.execute(
+                    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')"
+                )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {Event.objects.using(connection.alias).count()} events."
+            )
+        )
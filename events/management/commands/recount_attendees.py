@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from events.models import Event
+from events.utils import recount_attendees
+
+
+class Command(BaseCommand):
+    help = "Recount `Event.attendee_count` from the attendees table and repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report events whose counter has drifted.",
+        )
+
+    def handle(self, *args, **options):
+        drifted = [
+            (event_id, stored, actual)
+            for event_id, stored, actual in Event.objects.annotate(
+                actual=Count("attendees")
+            ).values_list("pk", "attendee_count", "actual")
+            if stored != actual
+        ]
+        for event_id, stored, actual in drifted:
+            self.stdout.write(f"Event {event_id}: stored {stored}, actual {actual}")
+
+        if drifted and not options["dry_run"]:
+            recount_attendees(event_id for event_id, _, _ in drifted)
+            self.stdout.write(
+                self.style.SUCCESS(f"Repaired {len(drifted)} event counter(s).")
+            )
+        elif not drifted:
+            self.stdout.write(self.style.SUCCESS("All attendee counters are correct."))
@@ -0,0 +1,115 @@
+import datetime
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from events.cache import invalidate_event_lists
+from events.models import Event
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic users and events with a long-tailed attendee distribution "
+        "for load tests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--events", type=int, default=10000)
+        parser.add_argument(
+            "--prefix",
+            default="loadtest",
+            help="Prefix of the generated usernames, which are <prefix><n>.",
+        )
+        parser.add_argument(
+            "--password",
+            default="loadtest",
+            help="Password shared by all generated users.",
+        )
+        parser.add_argument("--seed", type=int, help="Seed for reproducible data.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        today = timezone.now().date()
+
+        with transaction.atomic():
+            # Hashing once keeps seeding fast, every user gets the same password.
+            password = make_password(options["password"])
+            users = User.objects.bulk_create(
+                (
+                    User(username=f"{options['prefix']}{index}", password=password)
+                    for index in range(options["users"])
+                ),
+                batch_size=batch_size,
+            )
+            user_ids = [user.pk for user in users]
+
+            events, attendees = [], []
+            for index in range(options["events"]):
+                start_date = today + datetime.timedelta(days=rng.randint(-180, 365))
+                capacity = None if rng.random() < 0.2 else rng.randint(10, 500)
+                owner_id = rng.choice(user_ids)
+                event_attendees = self.pick_attendees(
+                    rng, user_ids, owner_id, capacity
+                )
+                events.append(
+                    Event(
+                        name=f"Event {index}",
+                        description=f"Synthetic event {index} for load tests.",
+                        start_date=start_date,
+                        end_date=start_date + datetime.timedelta(days=rng.randint(0, 5)),
+                        owner_id=owner_id,
+                        capacity=capacity,
+                        attendee_count=len(event_attendees),
+                    )
+                )
+                attendees.append(event_attendees)
+
+            events = Event.objects.bulk_create(events, batch_size=batch_size)
+            Attendee = Event.attendees.through
+            Attendee.objects.bulk_create(
+                (
+                    Attendee(event_id=event.pk, user_id=user_id)
+                    for event, event_attendees in zip(events, attendees)
+                    for user_id in event_attendees
+                ),
+                batch_size=batch_size,
+            )
+            invalidate_event_lists()
+
+        registrations = sum(len(event_attendees) for event_attendees in attendees)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(users)} users, {len(events)} events "
+                f"and {registrations} registrations."
+            )
+        )
+
+    @staticmethod
+    def pick_attendees(rng, user_ids, owner_id, capacity) -> list[int]:
+        """Pick the attendees of one event.
+
+        Popularity follows a Pareto distribution: most events draw a handful of
+        attendees and a few draw crowds, up to their capacity.
+
+        Args:
+            rng (random.Random): Random generator of the run.
+            user_ids (list[int]): IDs of all generated users.
+            owner_id (int): Owner of the event, who never attends it.
+            capacity (Optional[int]): Capacity of the event, None if unlimited.
+
+        Returns:
+            list[int]: Distinct user IDs of the attendees.
+        """
+        count = int(rng.paretovariate(1.2)) - 1
+        count = min(count, len(user_ids) - 1, capacity or count)
+        attendees = set(rng.sample(user_ids, count + 1)) - {owner_id}
+        return list(attendees)[:count]
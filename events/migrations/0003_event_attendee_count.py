@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2024-10-30 10:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_attendee_count(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    attendees_count = (
+        Event.attendees.through.objects.filter(event_id=OuterRef("pk"))
+        .values("event_id")
+        .annotate(total=Count("*"))
+        .values("total")
+    )
+    Event.objects.update(attendee_count=Coalesce(Subquery(attendees_count), Value(0)))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0002_event_capacity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="attendee_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_attendee_count, migrations.RunPython.noop),
+    ]
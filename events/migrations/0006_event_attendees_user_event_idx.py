@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 09:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0005_event_updated_at"),
+    ]
+
+    # The attendees table is created by Django for the many-to-many field and has
+    # no model to declare indexes on. The (user, event) index covers the lookups
+    # of a user's events, which the (event, user) unique index cannot serve.
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX event_attendees_user_event_idx "
+                "ON events_event_attendees (user_id, event_id)"
+            ),
+            reverse_sql="DROP INDEX event_attendees_user_event_idx",
+        ),
+    ]
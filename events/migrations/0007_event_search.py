@@ -0,0 +1,58 @@
+# Generated by Django 5.2 on 2026-10-18 10:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import events.models
+from events.search import (CREATE_SEARCH_INDEX, DROP_SEARCH_INDEX,
+                           REBUILD_SEARCH_INDEX)
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in CREATE_SEARCH_INDEX:
+        schema_editor.execute(statement)
+    schema_editor.execute(REBUILD_SEARCH_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_SEARCH_INDEX:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0006_event_attendees_user_event_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventSearch",
+            fields=[
+                (
+                    "event",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search",
+                        serialize=False,
+                        to="events.event",
+                    ),
+                ),
+                ("name", models.TextField()),
+                ("description", models.TextField()),
+                ("fts", events.models.FullTextField(db_column="events_event_fts")),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "events_event_fts",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
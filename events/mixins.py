@@ -0,0 +1,151 @@
+import hashlib
+from typing import Optional
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date, parse_http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from events.cache import event_list_cache
+
+
+class ConditionalGetMixin:
+    """
+    Adds strong `ETag` and `Last-Modified` validators to `list` and `retrieve`,
+    computed without loading or serializing any events. A list is validated by one
+    aggregate over the filtered events, their number and latest `updated_at`,
+    together with the time of the last deletion of any event, which the aggregate
+    cannot see. A detail is validated by its `updated_at` column. A matching
+    `If-None-Match` or `If-Modified-Since` request gets a 304 for that one query.
+    Searches too broad to be ranked are served without validators, aggregating
+    their matches would cost the scan their ordering avoids.
+    """
+
+    validator_field = "updated_at"
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if "search_id" in queryset.query.annotations:
+            return self.list_page(queryset)
+        state = queryset.aggregate(
+            count=Count("pk"), last_modified=Max(self.validator_field)
+        )
+        deleted = event_list_cache.last_deletion()
+        etag = quote_etag(
+            hashlib.sha1(
+                f"{request.get_full_path()}|{state['count']}|"
+                f"{state['last_modified']}|{deleted}".encode()
+            ).hexdigest()
+        )
+        timestamp = deleted // 10**9
+        if state["last_modified"] is not None:
+            timestamp = max(timestamp, int(state["last_modified"].timestamp()))
+        return self.validated_response(
+            request, etag, timestamp, lambda *args, **kwargs: self.list_page(queryset)
+        )
+
+    def list_page(self, queryset) -> Response:
+        """Paginate and serialize the filtered events, like `ListModelMixin.list`."""
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = {self.lookup_field: kwargs[self.lookup_url_kwarg or self.lookup_field]}
+        try:
+            last_modified = (
+                self.filter_queryset(self.get_queryset())
+                .filter(**lookup)
+                .values_list(self.validator_field, flat=True)
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            last_modified = None
+        return self.conditional_response(
+            request, last_modified, super().retrieve, *args, **kwargs
+        )
+
+    def conditional_response(self, request, last_modified, handler, *args, **kwargs):
+        """Answer with 304 if the client's copy is current, otherwise call `handler`.
+
+        Args:
+            request (Request): The request object.
+            last_modified (Optional[datetime]): Latest modification of the resource.
+            handler (Callable): View method producing the full response.
+
+        Returns:
+            Response: 304 response or the response of `handler` with the validators.
+        """
+        if last_modified is None:
+            return handler(request, *args, **kwargs)
+
+        etag = quote_etag(
+            hashlib.sha1(
+                f"{request.get_full_path()}|{last_modified}".encode()
+            ).hexdigest()
+        )
+        return self.validated_response(
+            request, etag, int(last_modified.timestamp()), handler, *args, **kwargs
+        )
+
+    def validated_response(
+        self, request, etag: str, timestamp: Optional[int], handler, *args, **kwargs
+    ):
+        """Evaluate the request preconditions against known validators.
+
+        Args:
+            request (Request): The request object.
+            etag (str): Quoted strong ETag of the resource.
+            timestamp (Optional[int]): Last modification as a Unix timestamp.
+            handler (Callable): View method producing the full response.
+
+        Returns:
+            Response: 304 response or the response of `handler` with the validators.
+        """
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        ) or handler(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response.headers["ETag"] = etag
+            if timestamp is not None:
+                response.headers["Last-Modified"] = http_date(timestamp)
+        return response
+
+
+class CachedListMixin:
+    """
+    Serves `list` from `event_list_cache`, keyed by the request's query parameters.
+    Cached entries keep the page data together with its validators, so a cache hit
+    answers plain and conditional requests without touching the database.
+    Must be placed before `ConditionalGetMixin`.
+    """
+
+    def list(self, request, *args, **kwargs):
+        key, entry = event_list_cache.get(request.query_params)
+        if entry is not None and entry["etag"] is None:
+            return Response(entry["data"])
+        if entry is not None:
+            return self.validated_response(
+                request,
+                entry["etag"],
+                entry["last_modified"],
+                lambda *args, **kwargs: Response(entry["data"]),
+            )
+
+        response = super().list(request, *args, **kwargs)
+        if key is not None and response.status_code == status.HTTP_200_OK:
+            last_modified = response.headers.get("Last-Modified")
+            event_list_cache.set(
+                key,
+                {
+                    "data": response.data,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": (
+                        parse_http_date(last_modified) if last_modified else None
+                    ),
+                },
+            )
+        return response
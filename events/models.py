@@ -8,12 +8,83 @@ class Event(models.Model):
     start_date = models.DateField()
     end_date = models.DateField()
     owner = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="owned_events"
+        User, on_delete=models.CASCADE, related_name="owned_events", db_index=False
     )
+    # The attendees table has an extra (user, event) index for the events a user
+    # attends, created by migration 0006.
     attendees = models.ManyToManyField(
         User, related_name="attending_events", blank=True
     )
     capacity = models.PositiveIntegerField(null=True, blank=True)
+    attendee_count = models.PositiveIntegerField(default=0, editable=False)
+    # Bumped on every change, including attendance, to validate conditional GETs.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # The owner lookups are served by the composite owner indexes,
+        # so the foreign key does not get its own index.
+        indexes = [
+            models.Index(fields=["start_date", "id"], name="event_start_date_idx"),
+            models.Index(fields=["end_date", "id"], name="event_end_date_idx"),
+            models.Index(fields=["owner", "start_date"], name="event_owner_start_idx"),
+            models.Index(fields=["owner", "end_date"], name="event_owner_end_idx"),
+            models.Index(
+                fields=["attendee_count", "id"], name="event_attendee_count_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class ImportProgress(models.Model):
+    """Rows of an input file that `import_events` has committed.
+
+    Updated in the transaction of every batch, so after a crash it matches the
+    imported events exactly and a rerun resumes without duplicating any.
+    """
+
+    source = models.CharField(max_length=1024, unique=True)
+    rows = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.source}: {self.rows} rows"
+
+
+class FullTextField(models.TextField):
+    """Hidden column of an FTS5 table, named after the table, for `match` lookups."""
+
+
+@FullTextField.register_lookup
+class FullTextMatch(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class EventSearch(models.Model):
+    """Row of the full-text index over the name and description of an event.
+
+    The FTS5 table is created by migration 0007 and kept in sync by triggers, see
+    `events.search`. It only exists on SQLite.
+    """
+
+    event = models.OneToOneField(
+        Event,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        related_name="search",
+    )
+    name = models.TextField()
+    description = models.TextField()
+    fts = FullTextField(db_column="events_event_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "events_event_fts"
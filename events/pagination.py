@@ -0,0 +1,232 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class Cursor(NamedTuple):
+    position: list
+    reverse: bool
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination that seeks on the ordering key instead of using OFFSET.
+
+    The queryset is ordered on its requested ordering (``default_ordering`` if none)
+    with the primary key appended as a tie-breaker. The cursor holds the key of the
+    last row of a page, so every page is a single indexed range query, no matter
+    how deep it is.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = int(settings.EVENTS_PAGE_SIZE)
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    default_ordering = ("start_date",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None) -> list:
+        page_queryset = self.get_page_queryset(queryset, request)
+        return self.finalize_page(list(page_queryset))
+
+    def get_page_queryset(self, queryset: QuerySet, request) -> QuerySet:
+        """Build the ordered and sliced queryset of the requested page.
+
+        Split from `paginate_queryset` so callers that evaluate querysets
+        asynchronously can reuse the pagination logic.
+
+        Args:
+            queryset (QuerySet): Filtered queryset to paginate.
+            request (Request): The current request.
+
+        Returns:
+            QuerySet: Queryset fetching one row more than the page size.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.cursor = self.decode_cursor(request, queryset)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        queryset = queryset.order_by(
+            *(
+                ("-" if descending != reverse else "") + field
+                for field, descending in self.ordering
+            )
+        )
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(self.cursor))
+        return queryset[: self.page_size + 1]
+
+    def finalize_page(self, results: list) -> list:
+        """Trim the extra row of a fetched page and remember the page boundaries.
+
+        Args:
+            results (list): Rows fetched with the queryset from `get_page_queryset`.
+
+        Returns:
+            list: Rows of the page in the requested order.
+        """
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if self.cursor is not None and self.cursor.reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset: QuerySet) -> list[tuple[str, bool]]:
+        """Return the keyset as `(field, descending)` pairs ending with the primary key.
+
+        An ordering that already ends with a primary key, e.g. the `search_id` of the
+        full-text index, is unique and left as it is, so the database can read it
+        from that key without sorting.
+        """
+        fields = [
+            field
+            for field in (queryset.query.order_by or self.default_ordering)
+            if field.lstrip("-") not in ("pk", "id")
+        ]
+        ordering = [(field.lstrip("-"), field.startswith("-")) for field in fields]
+        if ordering and self.is_primary_key(queryset, ordering[-1][0]):
+            return ordering
+        descending = ordering[-1][1] if ordering else False
+        return ordering + [("pk", descending)]
+
+    @staticmethod
+    def is_primary_key(queryset: QuerySet, field: str) -> bool:
+        output_field = queryset.query.chain().resolve_ref(field).output_field
+        return getattr(output_field, "primary_key", False)
+
+    def get_keyset_filter(self, cursor: Cursor) -> Q:
+        """Build the condition selecting rows strictly after the cursor position."""
+        condition = Q()
+        for index, (field, descending) in enumerate(self.ordering):
+            lookup = "lt" if descending != cursor.reverse else "gt"
+            preceding = {
+                name: value
+                for (name, _), value in zip(
+                    self.ordering[:index], cursor.position[:index]
+                )
+            }
+            condition |= Q(
+                **preceding, **{f"{field}__{lookup}": cursor.position[index]}
+            )
+        return condition
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(self.get_position(self.page[-1]), False))
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(self.get_position(self.page[0]), True))
+
+    def get_position(self, instance) -> list:
+        return [getattr(instance, field) for field, _ in self.ordering]
+
+    def encode_cursor(self, cursor: Cursor) -> str:
+        payload = {
+            "o": [field for field, _ in self.ordering],
+            "p": cursor.position,
+            "r": cursor.reverse,
+        }
+        encoded = urlsafe_b64encode(
+            json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+        ).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request, queryset: QuerySet) -> Optional[Cursor]:
+        """Read the cursor of the request, with its position in Python types.
+
+        Every position value is converted by the model field or annotation it is
+        compared with, so a tampered cursor is rejected as invalid instead of
+        failing in the query.
+
+        Args:
+            request (Request): The current request.
+            queryset (QuerySet): Queryset the ordering fields belong to.
+
+        Raises:
+            NotFound: If the cursor is malformed or does not match the ordering.
+
+        Returns:
+            Optional[Cursor]: The cursor, None if the request has none.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode()))
+            position, reverse = list(payload["p"]), bool(payload["r"])
+            fields = payload["o"]
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if fields != [field for field, _ in self.ordering] or len(position) != len(
+            self.ordering
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        query = queryset.query.chain()
+        try:
+            position = [
+                query.resolve_ref(field).output_field.to_python(value)
+                for (field, _), value in zip(self.ordering, position)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(position, reverse)
+
+
+class AttendeePagination(KeysetPagination):
+    """Keyset pagination over the attendees table of one event, by user ID.
+
+    A user attends an event at most once, so the user ID alone is the keyset and
+    every page is a range scan of the `(event_id, user_id)` unique index.
+    """
+
+    default_ordering = ("user_id",)
+
+    def get_ordering(self, queryset: QuerySet) -> list[tuple[str, bool]]:
+        return [("user_id", False)]
@@ -10,7 +10,7 @@ class IsEventOwner(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in ["GET", "HEAD", "OPTIONS"]:
             return True
-        if not obj.owner == request.user:
+        if obj.owner_id != request.user.pk:
             raise AuthenticationFailed("Can't update or delete events of other owners.")
         else:
             return True
@@ -0,0 +1,123 @@
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+
+# SQLite FTS5 index over the name and description of events. It is an external
+# content table, the text is only stored in `events_event`, and triggers keep the
+# index in step with every write, including bulk and raw SQL writes.
+SEARCH_TABLE = "events_event_fts"
+
+# A match in the name weighs ten times more than one in the description.
+SEARCH_RANKING = "bm25(10.0, 1.0)"
+
+# Shortest prefix the index holds, see `prefix='2 3'` below.
+MIN_PREFIX_LENGTH = 2
+
+CREATE_SEARCH_INDEX = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        name,
+        description,
+        content='events_event',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rank)
+    VALUES ('rank', '{SEARCH_RANKING}')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_insert AFTER INSERT ON events_event
+    BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_delete AFTER DELETE ON events_event
+    BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_update
+    AFTER UPDATE OF name, description ON events_event
+    BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {SEARCH_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+DROP_SEARCH_INDEX = [
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_update",
+    f"DROP TABLE IF EXISTS {SEARCH_TABLE}",
+]
+
+REBUILD_SEARCH_INDEX = f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+
+
+def build_match_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Words are quoted, so FTS5 operators and special characters in the text are
+    searched for literally. Single characters match whole words only, the index
+    has no prefixes of that length and would scan every term starting with them.
+
+    Args:
+        text (str): The text entered by the user.
+
+    Returns:
+        str: FTS5 query, empty if the text has no words.
+    """
+    return " ".join(
+        f'"{word}"*' if len(word) >= MIN_PREFIX_LENGTH else f'"{word}"'
+        for word in re.findall(r"\w+", text)
+    )
+
+
+def search_events(queryset: QuerySet, text: str) -> QuerySet:
+    """Filter events by the words of `text` in their name or description.
+
+    On SQLite the full-text index is used and the events are annotated with their
+    `search_rank`, lower is more relevant. Ranking runs over every match, which
+    takes seconds for words found in most events, so queries matching more than
+    `SEARCH_RANK_LIMIT` events are annotated with `search_id` instead, the rowid
+    the index returns its matches in without sorting. Other databases fall back to
+    case-insensitive substring matches on every word.
+
+    Args:
+        queryset (QuerySet): Events to search.
+        text (str): The text entered by the user.
+
+    Returns:
+        QuerySet: Matching events.
+    """
+    if connections[queryset.db].vendor != "sqlite":
+        for word in re.findall(r"\w+", text):
+            queryset = queryset.filter(
+                Q(name__icontains=word) | Q(description__icontains=word)
+            )
+        return queryset
+
+    # Imported here, migrations and benchmarks use this module without the models.
+    from events.models import EventSearch
+
+    query = build_match_query(text)
+    if not query:
+        return queryset
+    queryset = queryset.filter(search__fts__match=query)
+    limit = int(settings.SEARCH_RANK_LIMIT)
+    matches = EventSearch.objects.using(queryset.db).filter(fts__match=query)
+    if matches.values("pk")[limit : limit + 1].exists():
+        return queryset.annotate(search_id=F("search__event"))
+    return queryset.annotate(search_rank=F("search__rank"))
@@ -1,8 +1,14 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
+from events.cache import invalidate_event_lists
 from events.models import Event
 
+User = get_user_model()
+
 
 class ReadEventSerializer(serializers.ModelSerializer):
     class Meta:
@@ -10,6 +16,20 @@ class ReadEventSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class CompactEventSerializer(serializers.ModelSerializer):
+    """Event representation without the attendee IDs, only their count."""
+
+    class Meta:
+        model = Event
+        exclude = ("attendees",)
+
+
+class AttendeeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ("id", "username")
+
+
 class EventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
@@ -28,8 +48,8 @@ class EventSerializer(serializers.ModelSerializer):
         Raises:
             ValidationError: If `end_date` is earlier than `start_date`.
         """
-        start_date = attrs.get("start_date")
-        end_date = attrs.get("end_date")
+        start_date = attrs.get("start_date", getattr(self.instance, "start_date", None))
+        end_date = attrs.get("end_date", getattr(self.instance, "end_date", None))
 
         if start_date and end_date and end_date < start_date:
             raise serializers.ValidationError(
@@ -50,11 +70,106 @@ class EventSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         owner = None
         if request and hasattr(request, "user"):
-            User = get_user_model()
-            owner = User.objects.get(id=request.user.id)
+            owner = request.user
         event = Event.objects.create(**validated_data, owner=owner)
         return event
 
 
+class BulkEventListSerializer(serializers.ListSerializer):
+    """Writes a list of events with batched `bulk_create`/`bulk_update` statements.
+
+    For updates `instance` is a mapping of event ID to the events the user may edit,
+    so every item is validated against the event it changes.
+    """
+
+    def run_child_validation(self, data):
+        self.child.instance = None
+        if self.instance is not None:
+            event_id = data.get("id") if isinstance(data, dict) else None
+            if event_id not in self.instance:
+                raise serializers.ValidationError(
+                    {"id": "Event not found or owned by another user."}
+                )
+            self.child.instance = self.instance[event_id]
+        return super().run_child_validation(data)
+
+    def create(self, validated_data: list[dict]) -> list[Event]:
+        """Create all events in batches of `EVENTS_BULK_BATCH_SIZE` in one transaction.
+
+        Args:
+            validated_data (list[dict]): Validated data of the events, including the owner.
+
+        Returns:
+            list[Event]: Created events with their primary keys set.
+        """
+        events = []
+        for attrs in validated_data:
+            attrs.pop("id", None)
+            events.append(Event(**attrs))
+        with transaction.atomic():
+            events = Event.objects.bulk_create(
+                events, batch_size=int(settings.EVENTS_BULK_BATCH_SIZE)
+            )
+            invalidate_event_lists({event.owner_id for event in events})
+        return events
+
+    def update(
+        self, instance: dict[int, Event], validated_data: list[dict]
+    ) -> list[Event]:
+        """Apply the changes to the events in batches of `EVENTS_BULK_BATCH_SIZE`.
+
+        Args:
+            instance (dict[int, Event]): Events that can be updated, keyed by their ID.
+            validated_data (list[dict]): Validated changes, each with the event `id`.
+
+        Returns:
+            list[Event]: Updated events.
+        """
+        events, fields = [], {"updated_at"}
+        updated_at = timezone.now()
+        for attrs in validated_data:
+            event = instance[attrs.pop("id")]
+            for field, value in attrs.items():
+                setattr(event, field, value)
+            # bulk_update() bypasses `auto_now`, so the timestamp is set explicitly.
+            event.updated_at = updated_at
+            fields.update(attrs)
+            events.append(event)
+        if len(fields) > 1:
+            with transaction.atomic():
+                Event.objects.bulk_update(
+                    events, fields, batch_size=int(settings.EVENTS_BULK_BATCH_SIZE)
+                )
+                invalidate_event_lists({event.owner_id for event in events})
+        return events
+
+
+class BulkEventSerializer(EventSerializer):
+    id = serializers.IntegerField(required=False)
+
+    class Meta(EventSerializer.Meta):
+        list_serializer_class = BulkEventListSerializer
+
+
 class EventRegistrationSerializer(serializers.Serializer):
     register = serializers.BooleanField()
+
+
+class BulkEventRegistrationItemSerializer(EventRegistrationSerializer):
+    event = serializers.IntegerField()
+
+
+class BulkEventRegistrationSerializer(serializers.Serializer):
+    registrations = BulkEventRegistrationItemSerializer(
+        many=True, allow_empty=False, max_length=1000
+    )
+
+
+class BulkAttendeeRegistrationItemSerializer(EventRegistrationSerializer):
+    user = serializers.IntegerField()
+
+
+class BulkAttendeeRegistrationSerializer(serializers.Serializer):
+    registrations = BulkAttendeeRegistrationItemSerializer(
+        many=True, allow_empty=False, max_length=1000
+    )
@@ -0,0 +1,64 @@
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from events.cache import invalidate_event_lists, record_event_deletion
+from events.models import Event
+from events.utils import recount_attendees
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def update_attendee_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep `Event.attendee_count` in step with changes made through the ORM relation.
+
+    Additions from the event side are applied incrementally, every other change
+    recounts only the affected events.
+    """
+    if action == "pre_clear" and reverse:
+        # The cleared events are unknown after the rows are gone, remember them now.
+        instance._cleared_event_ids = list(
+            instance.attending_events.values_list("pk", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        if action == "post_add":
+            if pk_set:
+                Event.objects.filter(pk=instance.pk).update(
+                    attendee_count=F("attendee_count") + len(pk_set),
+                    updated_at=timezone.now(),
+                )
+                invalidate_event_lists([instance.owner_id])
+        else:
+            recount_attendees([instance.pk])
+    elif action == "post_clear":
+        recount_attendees(instance.__dict__.pop("_cleared_event_ids", []))
+    elif pk_set:
+        recount_attendees(pk_set)
+
+
+@receiver(pre_delete, sender=User)
+def release_places_of_deleted_user(sender, instance, **kwargs):
+    """Release the places held by a user before their attendance rows are cascaded."""
+    updated = Event.objects.filter(attendees=instance).update(
+        attendee_count=F("attendee_count") - 1, updated_at=timezone.now()
+    )
+    if updated:
+        invalidate_event_lists()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_cached_lists(sender, instance, **kwargs):
+    """Drop the cached event lists that can contain the saved or deleted event."""
+    invalidate_event_lists([instance.owner_id])
+
+
+@receiver(post_delete, sender=Event)
+def record_deleted_event(sender, instance, **kwargs):
+    """Change the validators of the event lists, which cannot see the deletion."""
+    record_event_deletion()
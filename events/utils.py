@@ -1,15 +1,138 @@
+import operator
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+from functools import reduce
+from typing import Optional
+
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
+from events.cache import invalidate_event_lists
 from events.models import Event
+from monitoring.metrics import REGISTRATION_REJECTIONS
+
+PAST_EVENT_MESSAGE = "Cannot modify registration for past events."
+OWNER_MESSAGE = "The owner of the event cannot register or unregister."
+ALREADY_REGISTERED_MESSAGE = "User is already registered for this event."
+NOT_REGISTERED_MESSAGE = "User is not registered for this event."
+CAPACITY_MESSAGE = "Event has reached maximum capacity."
+NOT_FOUND_MESSAGE = "Event not found."
+DUPLICATE_MESSAGE = "Event is listed more than once."
+USER_NOT_FOUND_MESSAGE = "User not found."
+DUPLICATE_USER_MESSAGE = "User is listed more than once."
+
+# Reasons of rejected registrations, as labels of the rejection metric.
+REJECTION_REASONS = {
+    PAST_EVENT_MESSAGE: "past_event",
+    OWNER_MESSAGE: "owner",
+    ALREADY_REGISTERED_MESSAGE: "already_registered",
+    NOT_REGISTERED_MESSAGE: "not_registered",
+    CAPACITY_MESSAGE: "capacity",
+    NOT_FOUND_MESSAGE: "not_found",
+    DUPLICATE_MESSAGE: "duplicate",
+    USER_NOT_FOUND_MESSAGE: "user_not_found",
+    DUPLICATE_USER_MESSAGE: "duplicate",
+}
+
+
+def reject_registration(message: str) -> ValidationError:
+    """Count a rejected registration by its reason and build its error."""
+    REGISTRATION_REJECTIONS.labels(REJECTION_REASONS[message]).inc()
+    return ValidationError(message)
+
+
+def has_free_places(places: int = 1) -> Q:
+    """Condition matching events with at least `places` free places left."""
+    if places == 1:
+        return Q(capacity__isnull=True) | Q(attendee_count__lt=F("capacity"))
+    return Q(capacity__isnull=True) | Q(
+        attendee_count__lte=F("capacity") - places
+    )
+
+
+def recount_attendees(event_ids: Optional[Iterable[int]] = None) -> int:
+    """Recalculate the denormalized `attendee_count` from the attendees table.
+
+    Args:
+        event_ids (Optional[Iterable[int]]): Events to recount, all events if omitted.
+
+    Returns:
+        int: Number of events whose counter was rewritten.
+    """
+    attendees_count = (
+        Event.attendees.through.objects.filter(event_id=OuterRef("pk"))
+        .values("event_id")
+        .annotate(total=Count("*"))
+        .values("total")
+    )
+    events = Event.objects.all()
+    if event_ids is not None:
+        events = events.filter(pk__in=list(event_ids))
+    invalidate_event_lists()
+    return events.update(
+        attendee_count=Coalesce(Subquery(attendees_count), Value(0)),
+        updated_at=timezone.now(),
+    )
+
+
+def _add_attendee(event: Event, user: User) -> bool:
+    """Insert the attendance row only if the event still has free places.
+
+    The guarded counter increment takes the write lock on the event row, so
+    concurrent registrations cannot overbook the event.
+
+    Args:
+        event (Event): The event to register for.
+        user (User): The user to register.
+
+    Returns:
+        bool: True if the user was registered, False if the event is full.
+
+    Raises:
+        IntegrityError: If the user is already registered for this event.
+    """
+    with transaction.atomic():
+        reserved = Event.objects.filter(has_free_places(), pk=event.pk).update(
+            attendee_count=F("attendee_count") + 1, updated_at=timezone.now()
+        )
+        if reserved:
+            Event.attendees.through.objects.create(event_id=event.pk, user_id=user.pk)
+            invalidate_event_lists([event.owner_id])
+        return bool(reserved)
+
+
+def _remove_attendee(event: Event, user: User) -> bool:
+    """Delete the attendance row and release the place it occupied.
+
+    Args:
+        event (Event): The event to unregister from.
+        user (User): The user to unregister.
+
+    Returns:
+        bool: True if the user was unregistered, False if they were not registered.
+    """
+    with transaction.atomic():
+        deleted, _ = Event.attendees.through.objects.filter(
+            event_id=event.pk, user_id=user.pk
+        ).delete()
+        if deleted:
+            Event.objects.filter(pk=event.pk).update(
+                attendee_count=F("attendee_count") - 1, updated_at=timezone.now()
+            )
+            invalidate_event_lists([event.owner_id])
+        return bool(deleted)
 
 
 def handle_event_registration(event: Event, user: User, register: bool) -> str:
     """Handles user registration or un-registration for an event.
 
     Validates that the event is in the future, and that the user is not the owner of the event.
-    Checks the event capacity.
+    Checks the event capacity at write time, so concurrent registrations cannot overbook it.
     Registers or unregisters the user based on the provided flag.
 
     Args:
@@ -24,23 +147,263 @@ def handle_event_registration(event: Event, user: User, register: bool) -> str:
         ValidationError: If any validation step fails.
     """
     if event.start_date < timezone.now().date():
-        raise ValidationError("Cannot modify registration for past events.")
+        raise reject_registration(PAST_EVENT_MESSAGE)
 
-    if user == event.owner:
-        raise ValidationError("The owner of the event cannot register or unregister.")
+    if user.pk == event.owner_id:
+        raise reject_registration(OWNER_MESSAGE)
 
     if register:
-        if user in event.attendees.all():
-            raise ValidationError("User is already registered for this event.")
+        try:
+            registered = _add_attendee(event, user)
+        except IntegrityError:
+            raise reject_registration(ALREADY_REGISTERED_MESSAGE)
 
-        # Checking the events maximum capacity
-        if event.capacity is not None and event.attendees.count() >= event.capacity:
-            raise ValidationError("Event has reached maximum capacity.")
-
-        event.attendees.add(user)
+        if not registered:
+            raise reject_registration(CAPACITY_MESSAGE)
         return "Registered successfully."
     else:
-        if user not in event.attendees.all():
-            raise ValidationError("User is not registered for this event.")
-        event.attendees.remove(user)
+        if not _remove_attendee(event, user):
+            raise reject_registration(NOT_REGISTERED_MESSAGE)
         return "Unregistered successfully."
+
+
+def _events_by_count(pairs: Iterable[tuple[int, int]]) -> dict[int, list[int]]:
+    """Group the events of (event ID, user ID) pairs by their number of pairs."""
+    events = defaultdict(list)
+    for event_id, count in Counter(event_id for event_id, _ in pairs).items():
+        events[count].append(event_id)
+    return events
+
+
+def _reserve_places(
+    pairs: list[tuple[int, int]], counts: dict[int, int], now: datetime
+) -> set[int]:
+    """Take the places of new registrations with guarded counter increments.
+
+    Every event is only incremented if it has a free place for each of its new
+    registrations, checked at write time like in `_add_attendee`, with one
+    statement per distinct number of places. If some events were full, the
+    reserved ones are told apart by their counters, which the locked rows keep
+    unchanged by other transactions.
+
+    Args:
+        pairs (list[tuple[int, int]]): (event ID, user ID) pairs to register.
+        counts (dict[int, int]): Attendee count of every event before the increments.
+        now (datetime): Timestamp written to the reserved events.
+
+    Returns:
+        set[int]: IDs of the events whose places were reserved.
+    """
+    event_ids = {event_id for event_id, _ in pairs}
+    reserved = 0
+    for places, ids in _events_by_count(pairs).items():
+        reserved += Event.objects.filter(has_free_places(places), pk__in=ids).update(
+            attendee_count=F("attendee_count") + places, updated_at=now
+        )
+    if reserved == len(event_ids):
+        return event_ids
+    return {
+        event_id
+        for event_id, count in Event.objects.filter(pk__in=event_ids).values_list(
+            "pk", "attendee_count"
+        )
+        if count > counts[event_id]
+    }
+
+
+def _write_registrations(
+    to_add: list[tuple[int, int]],
+    to_remove: list[tuple[int, int]],
+    events: dict[int, Event],
+) -> set[int]:
+    """Write accepted registrations with set-based statements.
+
+    Unregistrations run first, so the places they free can be taken by the new
+    registrations. Registrations are only inserted for events that still had room
+    for all of them, see `_reserve_places`.
+
+    Args:
+        to_add (list[tuple[int, int]]): (event ID, user ID) pairs to register.
+        to_remove (list[tuple[int, int]]): (event ID, user ID) pairs to unregister.
+        events (dict[int, Event]): The events of the pairs, locked and read in the
+            current transaction.
+
+    Returns:
+        set[int]: IDs of the events that were too full for their new registrations.
+    """
+    attendees = Event.attendees.through
+    now = timezone.now()
+    counts = {event_id: event.attendee_count for event_id, event in events.items()}
+    if to_remove:
+        attendees.objects.filter(
+            reduce(
+                operator.or_,
+                (Q(event_id=event, user_id=user) for event, user in to_remove),
+            )
+        ).delete()
+        for places, event_ids in _events_by_count(to_remove).items():
+            Event.objects.filter(pk__in=event_ids).update(
+                attendee_count=F("attendee_count") - places, updated_at=now
+            )
+            for event_id in event_ids:
+                counts[event_id] -= places
+    if not to_add:
+        return set()
+    reserved = _reserve_places(to_add, counts, now)
+    attendees.objects.bulk_create(
+        attendees(event_id=event_id, user_id=user_id)
+        for event_id, user_id in to_add
+        if event_id in reserved
+    )
+    return {event_id for event_id, _ in to_add} - reserved
+
+
+def _write_results(
+    candidates: list[tuple[dict, int, int, Optional[str]]],
+    events: dict[int, Event],
+    key: str,
+) -> list[dict]:
+    """Write the accepted registrations of a batch and report every item.
+
+    Args:
+        candidates (list[tuple[dict, int, int, Optional[str]]]): Every item with its
+            event ID, its user ID and the error it was rejected with, if any.
+        events (dict[int, Event]): The events of the batch by their ID.
+        key (str): Field of the items reported with each result.
+
+    Returns:
+        list[dict]: Per-item results in the order of `candidates`, each with the
+            `key` of the item, the `register` flag, a `success` flag and a `message`.
+    """
+    to_add, to_remove = [], []
+    for item, event_id, user_id, error in candidates:
+        if error is None:
+            (to_add if item["register"] else to_remove).append((event_id, user_id))
+    full = _write_registrations(to_add, to_remove, events)
+    if to_add or to_remove:
+        invalidate_event_lists(
+            events[event_id].owner_id for event_id, _ in to_add + to_remove
+        )
+
+    results = []
+    for item, event_id, _, error in candidates:
+        if error is None and item["register"] and event_id in full:
+            error = CAPACITY_MESSAGE
+        if error is not None:
+            REGISTRATION_REJECTIONS.labels(REJECTION_REASONS[error]).inc()
+        elif item["register"]:
+            message = "Registered successfully."
+        else:
+            message = "Unregistered successfully."
+        results.append(
+            {
+                key: item[key],
+                "register": item["register"],
+                "success": error is None,
+                "message": error or message,
+            }
+        )
+    return results
+
+
+def handle_bulk_event_registration(user: User, items: list[dict]) -> list[dict]:
+    """Registers or unregisters a user for many events at once.
+
+    Applies the same rules as `handle_event_registration` to every item, but reads the
+    events and the user's registrations with one query each and writes all accepted
+    items with set-based statements inside a single transaction. The capacity of
+    every event is checked by its guarded counter increment, at write time.
+
+    Args:
+        user (User): The user attempting to register/unregister.
+        items (list[dict]): Items with the `event` ID and the `register` flag.
+
+    Returns:
+        list[dict]: Per-item results in the order of `items`, each with the `event`,
+            the `register` flag, a `success` flag and a `message`.
+    """
+    event_ids = {item["event"] for item in items}
+    today = timezone.now().date()
+
+    with transaction.atomic():
+        events = Event.objects.select_for_update().in_bulk(event_ids)
+        registered = set(
+            Event.attendees.through.objects.filter(
+                user_id=user.pk, event_id__in=event_ids
+            ).values_list("event_id", flat=True)
+        )
+
+        seen, candidates = set(), []
+        for item in items:
+            event_id, register = item["event"], item["register"]
+            event = events.get(event_id)
+            if event is None:
+                error = NOT_FOUND_MESSAGE
+            elif event_id in seen:
+                error = DUPLICATE_MESSAGE
+            elif event.start_date < today:
+                error = PAST_EVENT_MESSAGE
+            elif user.pk == event.owner_id:
+                error = OWNER_MESSAGE
+            elif register and event_id in registered:
+                error = ALREADY_REGISTERED_MESSAGE
+            elif not register and event_id not in registered:
+                error = NOT_REGISTERED_MESSAGE
+            else:
+                error = None
+            seen.add(event_id)
+            candidates.append((item, event_id, user.pk, error))
+
+        return _write_results(candidates, events, "event")
+
+
+def handle_bulk_attendee_registration(event: Event, items: list[dict]) -> list[dict]:
+    """Registers or unregisters many users for one event at once.
+
+    Meant for the owner of the event, who cannot be registered. Applies the same
+    rules as `handle_event_registration` to every item, reading the users and their
+    registrations with one query each. All new registrations take their places with
+    one guarded counter increment, so they are only accepted together, if the event
+    has room for all of them.
+
+    Args:
+        event (Event): The event to register/unregister the users for.
+        items (list[dict]): Items with the `user` ID and the `register` flag.
+
+    Returns:
+        list[dict]: Per-item results in the order of `items`, each with the `user`,
+            the `register` flag, a `success` flag and a `message`.
+    """
+    user_ids = {item["user"] for item in items}
+
+    with transaction.atomic():
+        event = Event.objects.select_for_update().get(pk=event.pk)
+        users = set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True))
+        registered = set(
+            Event.attendees.through.objects.filter(
+                event_id=event.pk, user_id__in=user_ids
+            ).values_list("user_id", flat=True)
+        )
+        past = event.start_date < timezone.now().date()
+
+        seen, candidates = set(), []
+        for item in items:
+            user_id, register = item["user"], item["register"]
+            if past:
+                error = PAST_EVENT_MESSAGE
+            elif user_id not in users:
+                error = USER_NOT_FOUND_MESSAGE
+            elif user_id in seen:
+                error = DUPLICATE_USER_MESSAGE
+            elif user_id == event.owner_id:
+                error = OWNER_MESSAGE
+            elif register and user_id in registered:
+                error = ALREADY_REGISTERED_MESSAGE
+            elif not register and user_id not in registered:
+                error = NOT_REGISTERED_MESSAGE
+            else:
+                error = None
+            seen.add(user_id)
+            candidates.append((item, event.pk, user_id, error))
+
+        return _write_results(candidates, {event.pk: event}, "user")
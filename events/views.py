@@ -1,23 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from events.export import EXPORT_FORMATS, aiter_export, iter_event_chunks
 from events.filters import EventFilter
+from events.mixins import CachedListMixin, ConditionalGetMixin
 from events.models import Event
+from events.pagination import AttendeePagination, KeysetPagination
 from events.permissions import IsEventOwner
-from events.serializers import (EventRegistrationSerializer, EventSerializer,
+from events.serializers import (AttendeeSerializer,
+                                BulkAttendeeRegistrationSerializer,
+                                BulkEventRegistrationSerializer,
+                                BulkEventSerializer, CompactEventSerializer,
+                                EventRegistrationSerializer, EventSerializer,
                                 ReadEventSerializer)
-from events.utils import handle_event_registration
+from events.utils import (handle_bulk_attendee_registration,
+                          handle_bulk_event_registration,
+                          handle_event_registration)
 from tokens_auth.permissions import HasValidAccessToken
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(CachedListMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     A viewset that provides CRUD actions for events.
     Users can create, update, and view events, with restrictions based on ownership.
+    List and detail responses support conditional GET through `ETag` and
+    `Last-Modified`. List pages are cached per filter combination until a write
+    invalidates them.
     """
 
     queryset = Event.objects.all()
@@ -25,11 +42,175 @@ class EventViewSet(viewsets.ModelViewSet):
     permission_classes = [HasValidAccessToken, IsEventOwner]
     filter_backends = [DjangoFilterBackend]
     filterset_class = EventFilter
+    pagination_class = KeysetPagination
+    # Queries per action with a cold token cache, enforced in the test suite. The
+    # bulk action is left out, its batched statements grow with the payload. The
+    # export is streamed, its queries run after the view has returned. A search
+    # adds one query to the list, counting its matches up to `SEARCH_RANK_LIMIT`.
+    # Bulk registrations are budgeted for batches that unregister and register
+    # users and find an event full.
+    query_budget = {
+        "list": 5,
+        "retrieve": 4,
+        "create": 3,
+        "update": 4,
+        "partial_update": 4,
+        "destroy": 4,
+        "register": 4,
+        "bulk_register": 8,
+        "bulk_register_attendees": 10,
+        "export": 1,
+        "attendees": 3,
+        "attending": 2,
+        "owned": 2,
+    }
+
+    @property
+    def expand_attendees(self) -> bool:
+        return self.request.query_params.get("expand") == "attendees"
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.get_serializer_class() is ReadEventSerializer:
+            User = get_user_model()
+            queryset = queryset.prefetch_related(
+                Prefetch("attendees", queryset=User.objects.only("id"))
+            )
+        return queryset
 
     def get_serializer_class(self):
-        if self.request.method == "GET":
-            return ReadEventSerializer
-        return EventSerializer
+        if self.action in ("list", "retrieve", "attending", "owned"):
+            if self.expand_attendees:
+                return ReadEventSerializer
+            return CompactEventSerializer
+        return super().get_serializer_class()
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "expand",
+                enum=["attendees"],
+                description="Include the attendee IDs of every event.",
+            )
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        """
+        List events with their attendee count, paginated by an opaque cursor.
+        Attendee IDs are only included with `?expand=attendees`.
+        """
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "expand",
+                enum=["attendees"],
+                description="Include the attendee IDs of the event.",
+            )
+        ]
+    )
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retrieve an event with its attendee count. The attendees are listed by
+        `attendees/`, their IDs are only included with `?expand=attendees`.
+        """
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(
+        detail=True,
+        serializer_class=AttendeeSerializer,
+        pagination_class=AttendeePagination,
+    )
+    def attendees(self, request, pk=None):
+        """
+        List the attendees of an event ordered by their ID, paginated by an opaque
+        cursor. Each page is a range scan of the attendees table.
+        """
+        event = self.get_object()
+        queryset = (
+            Event.attendees.through.objects.filter(event_id=event.pk)
+            .select_related("user")
+            .only("user__id", "user__username")
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer([row.user for row in page], many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "expand",
+                enum=["attendees"],
+                description="Include the attendee IDs of every event.",
+            )
+        ]
+    )
+    @action(detail=False)
+    def attending(self, request):
+        """
+        List the events the user attends, with the filters and pagination of the
+        events list. The user's rows are read from the (user, event) index of the
+        attendees table.
+        """
+        return self.list_events(self.get_queryset().filter(attendees=request.user))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "expand",
+                enum=["attendees"],
+                description="Include the attendee IDs of every event.",
+            )
+        ]
+    )
+    @action(detail=False)
+    def owned(self, request):
+        """
+        List the events the user owns, with the filters and pagination of the
+        events list. Pages are read in order from the owner indexes.
+        """
+        return self.list_events(self.get_queryset().filter(owner=request.user))
+
+    def list_events(self, queryset):
+        page = self.paginate_queryset(self.filter_queryset(queryset))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "export_format",
+                enum=[*EXPORT_FORMATS],
+                location=OpenApiParameter.PATH,
+            )
+        ],
+        responses={
+            (200, content_type): OpenApiTypes.STR
+            for content_type, _ in EXPORT_FORMATS.values()
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=f"export/(?P<export_format>{'|'.join(EXPORT_FORMATS)})",
+    )
+    def export(self, request, export_format=None):
+        """
+        Stream all events matching the list filters with their attendee IDs,
+        as newline delimited JSON or CSV.
+
+        Events are read in chunks and every chunk is written as soon as it is
+        fetched, so memory use and time to first byte do not grow with the export.
+        """
+        content_type, render = EXPORT_FORMATS[export_format]
+        content = render(iter_event_chunks(self.filter_queryset(Event.objects.all())))
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_export(content)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="events.{export_format}"'
+        )
+        return response
 
     @extend_schema(
         request=EventRegistrationSerializer
@@ -70,3 +251,112 @@ class EventViewSet(viewsets.ModelViewSet):
             return Response({"message": message}, status=status.HTTP_200_OK)
         except ValidationError as e:
             return Response({"message": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+    @extend_schema(
+        request=BulkEventRegistrationSerializer
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-register",
+        serializer_class=BulkEventRegistrationSerializer,
+        permission_classes=[HasValidAccessToken],
+    )
+    def bulk_register(self, request):
+        """
+        Custom action to register or unregister a user for many events in one request.
+
+        Args:
+            request (Request): The request object with a list of `registrations`,
+                each holding an `event` ID and a `register` flag.
+
+        Returns:
+            Response: Per-item results, in the order of the submitted registrations.
+        """
+        serializer = BulkEventRegistrationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = handle_bulk_event_registration(
+            user=request.user, items=serializer.validated_data["registrations"]
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=BulkAttendeeRegistrationSerializer
+    )
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="attendees/bulk-register",
+        serializer_class=BulkAttendeeRegistrationSerializer,
+    )
+    def bulk_register_attendees(self, request, pk=None):
+        """
+        Custom action for the owner of an event to register or unregister many users
+        for it in one request. New registrations are only accepted if the event has
+        room for all of them.
+
+        Args:
+            request (Request): The request object with a list of `registrations`,
+                each holding a `user` ID and a `register` flag.
+            pk (int): The primary key of the event.
+
+        Returns:
+            Response: Per-item results, in the order of the submitted registrations.
+        """
+        event = self.get_object()
+        serializer = BulkAttendeeRegistrationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = handle_bulk_attendee_registration(
+            event=event, items=serializer.validated_data["registrations"]
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=BulkEventSerializer(many=True)
+    )
+    @action(
+        detail=False,
+        methods=["post", "patch"],
+        url_path="bulk",
+        serializer_class=BulkEventSerializer,
+        permission_classes=[HasValidAccessToken],
+    )
+    def bulk(self, request):
+        """
+        Custom action to create (POST) or update (PATCH) many events in one request.
+
+        Args:
+            request (Request): The request object with a list of events. Every event
+                to update must carry its `id` and be owned by the user.
+
+        Returns:
+            Response: IDs of the created or updated events.
+        """
+        instance = None
+        if request.method == "PATCH" and isinstance(request.data, list):
+            event_ids = [
+                item.get("id") for item in request.data if isinstance(item, dict)
+            ]
+            instance = Event.objects.filter(owner=request.user).in_bulk(
+                [event_id for event_id in event_ids if isinstance(event_id, int)]
+            )
+
+        serializer = BulkEventSerializer(
+            instance,
+            data=request.data,
+            many=True,
+            partial=instance is not None,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        if instance is None:
+            events = serializer.save(owner=request.user)
+        else:
+            events = serializer.save()
+
+        return Response(
+            {"ids": [event.pk for event in events]},
+            status=status.HTTP_201_CREATED if instance is None else status.HTTP_200_OK,
+        )
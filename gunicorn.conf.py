@@ -0,0 +1,52 @@
+"""
+Gunicorn configuration of the production serving mode, see `run.sh`.
+
+The application is loaded once in the master and forked into the workers, so the
+imported code is shared copy-on-write. Workers are restarted gracefully after a
+number of requests to bound memory growth. Prometheus metrics of the workers are
+collected in files under `PROMETHEUS_MULTIPROC_DIR`, which is set here before the
+application is loaded.
+"""
+
+import glob
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+if os.getenv("SERVER_MODE") == "asgi":
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    worker_class = "gthread"
+    threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+preload_app = True
+
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+
+accesslog = "-"
+
+# Created before the preloaded application registers its metrics. Samples of a
+# previous run would be aggregated into the new one, so their files are removed
+# first. Only the sample files, the directory may hold anything else.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/tiko-metrics")
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+for path in glob.glob(os.path.join(os.environ["PROMETHEUS_MULTIPROC_DIR"], "*.db")):
+    os.remove(path)
+
+
+def post_fork(server, worker):
+    # Database connections must never be shared between forked workers.
+    from django.db import connections
+
+    connections.close_all()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
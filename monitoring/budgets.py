@@ -0,0 +1,91 @@
+import logging
+from typing import Optional
+
+from monitoring.queries import QueryStats
+
+logger = logging.getLogger("monitoring.budgets")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more SQL queries than its declared `query_budget`."""
+
+
+def resolve_view(request) -> tuple[Optional[type], str]:
+    """Find the view class and the action that served a request.
+
+    Args:
+        request (HttpRequest): The served request.
+
+    Returns:
+        tuple[Optional[type], str]: The view class, None for function views or
+            unresolved URLs, and the viewset action or the lowercase HTTP method.
+    """
+    method = request.method.lower()
+    match = request.resolver_match
+    if match is None:
+        return None, method
+    view_class = getattr(match.func, "cls", None) or getattr(
+        match.func, "view_class", None
+    )
+    action = (getattr(match.func, "actions", None) or {}).get(method, method)
+    return view_class, action
+
+
+def get_view_name(request) -> str:
+    """Name the view of a request as `<view class>.<action>`.
+
+    E.g. `EventViewSet.list`.
+    """
+    view_class, action = resolve_view(request)
+    if view_class is not None:
+        return f"{view_class.__name__}.{action}"
+    if request.resolver_match is not None:
+        return request.resolver_match.view_name
+    return "unresolved"
+
+
+def get_query_budget(request) -> Optional[int]:
+    """Look up the query budget declared by the view that served a request.
+
+    Views declare `query_budget` as a number of queries, or for viewsets as a dict
+    mapping action names to a number of queries. Plain views may key the dict by the
+    lowercase HTTP method instead.
+
+    Args:
+        request (HttpRequest): The served request.
+
+    Returns:
+        Optional[int]: The budget, None if the view does not declare one.
+    """
+    view_class, action = resolve_view(request)
+    budget = getattr(view_class, "query_budget", None)
+    if isinstance(budget, dict):
+        return budget.get(action)
+    return budget
+
+
+def check_query_budget(request, stats: QueryStats, enforce: bool) -> None:
+    """Check the queries of a request against the budget of its view.
+
+    Args:
+        request (HttpRequest): The served request.
+        stats (QueryStats): Queries run while serving it.
+        enforce (bool): Raise instead of logging a warning if the budget is exceeded.
+
+    Raises:
+        QueryBudgetExceeded: If enforced and the view ran more queries than budgeted.
+    """
+    budget = get_query_budget(request)
+    if budget is None or stats.count <= budget:
+        return
+    statements = "\n".join(
+        f"  {index}. {sql}" for index, sql in enumerate(stats.statements, 1)
+    )
+    message = (
+        f"{get_view_name(request)} ran {stats.count} queries for "
+        f"{request.method} {request.path}, over its budget of {budget}:\n"
+        f"{statements}"
+    )
+    if enforce:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
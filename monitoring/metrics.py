@@ -0,0 +1,62 @@
+"""
+Prometheus metrics of the project.
+
+Under the multi-worker server every worker process writes its samples to memory
+mapped files in `PROMETHEUS_MULTIPROC_DIR`, which must be set before this module is
+imported, and the metrics view aggregates the files of all workers.
+"""
+
+import os
+
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry,
+                               Counter, Gauge, Histogram, generate_latest,
+                               multiprocess)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latency of HTTP requests by view and action.",
+    ["view", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Counter(
+    "db_queries_total", "SQL queries run while serving requests.", ["view"]
+)
+DB_QUERY_DURATION = Counter(
+    "db_query_duration_seconds_total",
+    "Time spent in SQL queries while serving requests.",
+    ["view"],
+)
+TOKEN_VALIDATIONS = Counter(
+    "token_validations_total",
+    "Outcomes of JWT decoding by token type.",
+    ["token_type", "outcome"],
+)
+EVENT_LIST_CACHE_REQUESTS = Counter(
+    "event_list_cache_requests_total",
+    "Lookups of the event list cache by scope, owner-filtered lists or all events.",
+    ["scope", "result"],
+)
+REGISTRATION_REJECTIONS = Counter(
+    "event_registration_rejections_total",
+    "Rejected event registrations and unregistrations by reason.",
+    ["reason"],
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render the metrics of all worker processes in the Prometheus text format.
+
+    Returns:
+        tuple[bytes, str]: The exposition and its content type.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,156 @@
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from monitoring.budgets import check_query_budget, get_view_name
+from monitoring.metrics import (DB_QUERIES, DB_QUERY_DURATION, REQUEST_LATENCY,
+                                REQUESTS_IN_FLIGHT)
+from monitoring.profiling import RequestProfiler, should_profile
+from monitoring.queries import track_queries
+
+logger = logging.getLogger("monitoring.requests")
+
+
+class RequestMetricsMiddleware:
+    """
+    Measures the SQL queries and database time of every request, independent of
+    DEBUG. They are sent as `Server-Timing` header, logged with the request, recorded
+    as Prometheus metrics by view and checked against the query budget of the view.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with REQUESTS_IN_FLIGHT.track_inprogress(), track_queries() as stats:
+            response = self.get_response(request)
+        return self.process_metrics(request, response, stats, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with REQUESTS_IN_FLIGHT.track_inprogress(), track_queries() as stats:
+            response = await self.get_response(request)
+        return self.process_metrics(request, response, stats, started)
+
+    def process_metrics(self, request, response, stats, started):
+        duration = (time.perf_counter() - started) * 1000
+        db_time = stats.duration * 1000
+        response["Server-Timing"] = (
+            f'db;dur={db_time:.2f};desc="{stats.count} queries", '
+            f"total;dur={duration:.2f}"
+        )
+        view = get_view_name(request)
+        REQUEST_LATENCY.labels(view, request.method, response.status_code).observe(
+            duration / 1000
+        )
+        DB_QUERIES.labels(view).inc(stats.count)
+        DB_QUERY_DURATION.labels(view).inc(stats.duration)
+        logger.info(
+            "%s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "view": view,
+                "status": response.status_code,
+                "db_queries": stats.count,
+                "db_time_ms": round(db_time, 2),
+                "duration_ms": round(duration, 2),
+            },
+        )
+        check_query_budget(
+            request, stats, enforce=settings.QUERY_BUDGET_ENFORCE
+        )
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests that carry the `X-Profile` header with `PROFILING_TOKEN`, and a
+    `PROFILING_SAMPLE_RATE` share of all other requests. Profiles are written to the
+    rotating store in `PROFILING_DIR` as pstats and collapsed stacks, and named in the
+    `X-Profile-Id` response header. Without a token or sample rate configured every
+    request is passed straight through.
+
+    Profiling covers the thread handling the request: the whole DRF stack under WSGI,
+    the event loop part of native async views under ASGI. One request per process is
+    profiled at a time, requests arriving meanwhile are served without a profile.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.rng = random.Random()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        profiler = self.start_profiler(request)
+        if profiler is None:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.stop()
+        return self.save(request, response, profiler)
+
+    async def __acall__(self, request):
+        profiler = self.start_profiler(request)
+        if profiler is None:
+            return await self.get_response(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.stop()
+        return self.save(request, response, profiler)
+
+    def should_profile(self, request) -> bool:
+        token = settings.PROFILING_TOKEN
+        sample_rate = float(settings.PROFILING_SAMPLE_RATE)
+        if not token and sample_rate <= 0:
+            return False
+        return should_profile(
+            request.headers.get("X-Profile"), token, sample_rate, self.rng
+        )
+
+    def start_profiler(self, request) -> Optional[RequestProfiler]:
+        """Return a started profiler, or None if the request is not profiled."""
+        if not self.should_profile(request):
+            return None
+        profiler = RequestProfiler(interval=float(settings.PROFILING_INTERVAL))
+        return profiler if profiler.start() else None
+
+    def save(self, request, response, profiler: RequestProfiler):
+        # A failing profile store must not fail the request it profiled.
+        try:
+            name = profiler.save(
+                Path(settings.PROFILING_DIR),
+                f"{request.method} {request.path}",
+                int(settings.PROFILING_MAX_FILES),
+            )
+        except Exception:
+            logger.warning("Could not save the profile", exc_info=True)
+            return response
+        response["X-Profile-Id"] = name
+        return response
@@ -0,0 +1,142 @@
+import cProfile
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from hmac import compare_digest
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger("monitoring.profiling")
+
+# cProfile can only be enabled once at a time, and records every thread of the
+# process, so a single request per process is profiled at any moment.
+_profiling_lock = threading.Lock()
+
+
+class StackSampler(threading.Thread):
+    """Samples the call stack of one thread at a fixed interval.
+
+    The samples are aggregated as collapsed stacks, one line per distinct stack from
+    the outermost to the innermost frame followed by its sample count, the input
+    format of flamegraph tools.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+class RequestProfiler:
+    """Profiles the current thread with cProfile and a stack sampler.
+
+    `start` and `stop` wrap the handling of one request. Afterwards `save` writes
+    the cProfile stats as `.pstats` and the samples as `.collapsed` to the profile
+    directory. Only one profiler runs per process, `start` declines while another
+    one is active.
+    """
+
+    def __init__(self, interval: float):
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), interval)
+
+    def start(self) -> bool:
+        """Start profiling, unless another request of the process is profiled.
+
+        Returns:
+            bool: True if profiling started, False if it is busy or failed.
+        """
+        if not _profiling_lock.acquire(blocking=False):
+            return False
+        try:
+            self.profile.enable()
+        except Exception:
+            _profiling_lock.release()
+            logger.warning("Could not start the profiler", exc_info=True)
+            return False
+        self.started = time.perf_counter()
+        self.sampler.start()
+        return True
+
+    def stop(self) -> None:
+        try:
+            self.profile.disable()
+            self.sampler.stop()
+        finally:
+            self.duration = time.perf_counter() - self.started
+            _profiling_lock.release()
+
+    def save(self, directory: Path, label: str, max_profiles: int) -> str:
+        """Write the profile and drop the oldest ones beyond `max_profiles`.
+
+        Args:
+            directory (Path): Directory of the profile store, created if missing.
+            label (str): Description of the request, part of the file names.
+            max_profiles (int): Number of profiles kept in the store.
+
+        Returns:
+            str: Name of the profile, the file names without their extension.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", label).strip("-")[:80]
+        name = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 10**9:09d}-"
+            f"{slug}-{self.duration * 1000:.0f}ms"
+        )
+        self.profile.dump_stats(directory / f"{name}.pstats")
+        (directory / f"{name}.collapsed").write_text(self.sampler.collapsed())
+        rotate_profiles(directory, max_profiles)
+        return name
+
+
+def rotate_profiles(directory: Path, max_profiles: int) -> None:
+    """Delete the oldest profiles of the store beyond `max_profiles`."""
+    profiles = sorted(directory.glob("*.pstats"))
+    for stats in profiles[: max(len(profiles) - max_profiles, 0)]:
+        stats.unlink(missing_ok=True)
+        stats.with_suffix(".collapsed").unlink(missing_ok=True)
+
+
+def should_profile(
+    header: Optional[str], token: Optional[str], sample_rate: float, rng
+) -> bool:
+    """Decide whether to profile a request.
+
+    Args:
+        header (Optional[str]): Value of the profiling request header.
+        token (Optional[str]): Token authorizing profiling by header, if configured.
+        sample_rate (float): Share of requests profiled at random.
+        rng (random.Random): Random generator for the sampling decision.
+
+    Returns:
+        bool: True if the header carries the token or the request is sampled.
+    """
+    if header and token and compare_digest(header.encode(), token.encode()):
+        return True
+    return sample_rate > 0 and rng.random() < sample_rate
@@ -0,0 +1,69 @@
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Transaction control differs between tests (savepoints) and production (BEGIN), so
+# it counts towards the database time but not towards the number of queries.
+TRANSACTION_STATEMENT = re.compile(
+    r"^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b", re.IGNORECASE
+)
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+class QueryStats:
+    """Number, duration and SQL of the queries run while tracking is active."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: list[str] = []
+
+    def add(self, sql: str, duration: float) -> None:
+        self.duration += duration
+        if not TRANSACTION_STATEMENT.match(sql):
+            self.count += 1
+            self.statements.append(sql)
+
+
+@contextmanager
+def track_queries():
+    """Collect the queries of all database connections used in the current context.
+
+    The stats live in a context variable, which `sync_to_async` carries into its
+    worker thread, so the queries of async views are collected as well.
+
+    Yields:
+        QueryStats: Stats filled in while the block runs.
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """Add `record_query` to the execute wrappers of a database connection.
+
+    Runs on `connection_created`, which fires again on every reconnect of the same
+    connection object.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
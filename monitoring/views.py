@@ -0,0 +1,9 @@
+from django.http import HttpResponse
+
+from monitoring.metrics import render_metrics
+
+
+def metrics(request):
+    """Expose the Prometheus metrics of all workers for scraping."""
+    output, content_type = render_metrics()
+    return HttpResponse(output, content_type=content_type)
@@ -1,5 +1,26 @@
 #!/bin/bash
+# SERVER_MODE selects how the app is served:
+#   wsgi (default) - gunicorn with threaded WSGI workers and production settings
+#   asgi           - gunicorn with uvicorn ASGI workers and production settings
+#   dev            - Django development server
+SERVER_MODE=${SERVER_MODE:-wsgi}
+export SERVER_MODE
+if [ "$SERVER_MODE" != "dev" ]; then
+  export DJANGO_SETTINGS_MODULE=${DJANGO_SETTINGS_MODULE:-tikoProject.settings_production}
+fi
+
 echo "Running migrations"
 python manage.py migrate --noinput
-echo "Starting DJANGO"
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+python manage.py createcachetable
+echo "Starting DJANGO ($SERVER_MODE)"
+case "$SERVER_MODE" in
+  dev)
+    exec python manage.py runserver 0.0.0.0:8000
+    ;;
+  asgi)
+    exec gunicorn tikoProject.asgi:application --config gunicorn.conf.py
+    ;;
+  *)
+    exec gunicorn tikoProject.wsgi:application --config gunicorn.conf.py
+    ;;
+esac
@@ -1,7 +1,48 @@
 import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
 from rest_framework.test import APIClient
 
+from events.cache import event_list_cache
+from tikoProject.routers import request_scope
+from tokens_auth.cache import token_cache
+from tokens_auth.revocation import revocation_store
+
+
+def pytest_configure(config):
+    # Requests over the query budget of their view fail the test.
+    settings.QUERY_BUDGET_ENFORCE = True
+
+    # A replica that never receives the writes to the primary, the worst case of
+    # replication lag. Tests opt in to reading from it through DATABASE_REPLICAS.
+    primary = connections[DEFAULT_DB_ALIAS].settings_dict
+    settings.DATABASES["stale_replica"] = {**primary, "TEST": {**primary["TEST"]}}
+
 
 @pytest.fixture(scope="session")
 def api_client() -> APIClient:
     yield APIClient()
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    token_cache.clear()
+    revocation_store.clear()
+    yield
+    token_cache.clear()
+    revocation_store.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_event_list_cache():
+    cache.clear()
+    event_list_cache.clear_stats()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_primary_pinning():
+    with request_scope():
+        yield
@@ -0,0 +1,71 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from tests.integration.utils.auth_utils import get_auth_headers
+
+pytest_plugins = ["tests.integration.utils.fixtures"]
+
+
+@pytest.mark.django_db
+def test_async_list_events(api_client, user, user3, event, event_2, fixed_datetime):
+    event_2.attendees.add(user3)
+    response = api_client.get(
+        reverse("async-event-list") + "?status=future&expand=attendees",
+        headers=get_auth_headers(user),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [e["name"] for e in results] == [event_2.name]
+    assert results[0]["attendees"] == [user3.id]
+
+
+@pytest.mark.django_db
+def test_async_list_events_without_token(api_client, event):
+    response = api_client.get(reverse("async-event-list"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_async_retrieve_event(api_client, user, event):
+    response = api_client.get(
+        reverse("async-event-detail", args=[event.id]), headers=get_auth_headers(user)
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == event.name
+    assert "attendees" not in response.json()
+
+    response = api_client.get(
+        reverse("async-event-detail", args=[event.id]) + "?expand=attendees",
+        headers=get_auth_headers(user),
+    )
+    assert response.json()["attendees"] == []
+
+    response = api_client.get(
+        reverse("async-event-detail", args=[9999]), headers=get_auth_headers(user)
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_async_register_for_event(api_client, user, user3, event_2, fixed_datetime):
+    url = reverse("async-event-register", args=[event_2.id])
+    response = api_client.post(
+        url, headers=get_auth_headers(user), data={"register": True}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert event_2.attendees.count() == 1
+
+    response = api_client.post(
+        url, headers=get_auth_headers(user3), data={"register": True}, format="json"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_async_search_events(api_client, user, event, event_2):
+    response = api_client.get(
+        reverse("async-event-list"), {"q": "event2"}, headers=get_auth_headers(user)
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [e["id"] for e in response.json()["results"]] == [event_2.id]
@@ -0,0 +1,19 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db
+def test_sqlite_connection_pragmas(settings):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        synchronous = cursor.fetchone()[0]
+        cursor.execute("PRAGMA temp_store")
+        temp_store = cursor.fetchone()[0]
+        cursor.execute("PRAGMA cache_size")
+        cache_size = cursor.fetchone()[0]
+
+    # 1 = NORMAL, 2 = MEMORY
+    assert synchronous == 1
+    assert temp_store == 2
+    assert cache_size == int(settings.SQLITE_PRAGMAS["cache_size"])
+    assert connection.transaction_mode == "IMMEDIATE"
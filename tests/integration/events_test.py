@@ -1,8 +1,30 @@
+import csv
+import json
+import os
+import threading
+import time
+import tracemalloc
+from base64 import urlsafe_b64encode
+from io import StringIO
+
 import pytest
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.db.models import F
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 
+from events.cache import event_list_cache
+from events.models import Event, ImportProgress
+from events.search import build_match_query
+from events.utils import (CAPACITY_MESSAGE, PAST_EVENT_MESSAGE,
+                          handle_bulk_event_registration,
+                          handle_event_registration)
 from tests.integration.utils.auth_utils import get_auth_headers
 
 User = get_user_model()
@@ -13,8 +35,8 @@ pytest_plugins = ["tests.integration.utils.fixtures"]
 def test_list_events(api_client, user, event):
     response = api_client.get(reverse("event-list"), headers=get_auth_headers(user))
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 1
-    assert response.data[0]["name"] == event.name
+    assert len(response.data["results"]) == 1
+    assert response.data["results"][0]["name"] == event.name
 
 
 @pytest.mark.django_db
@@ -23,8 +45,8 @@ def test_list_owned_events(api_client, user, event, user2):
         reverse("event-list") + f"?owner={user.id}", headers=get_auth_headers(user)
     )
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 1
-    assert response.data[0]["name"] == event.name
+    assert len(response.data["results"]) == 1
+    assert response.data["results"][0]["name"] == event.name
 
 
 @pytest.mark.django_db
@@ -36,14 +58,14 @@ def test_list_owned_events_filter_by_start_date(
         headers=get_auth_headers(user),
     )
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 1
-    assert response.data[0]["name"] == event_2.name
+    assert len(response.data["results"]) == 1
+    assert response.data["results"][0]["name"] == event_2.name
     response = api_client.get(
         reverse("event-list") + f"?start_date=2023-01-03",
         headers=get_auth_headers(user),
     )
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 0
+    assert len(response.data["results"]) == 0
 
 
 @pytest.mark.django_db
@@ -54,7 +76,7 @@ def test_list_owned_events_filter_by_status(
         reverse("event-list") + f"?status=future", headers=get_auth_headers(user)
     )
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 1
+    assert len(response.data["results"]) == 1
 
 
 @pytest.mark.django_db
@@ -187,3 +209,1155 @@ def test_register_owner_of_an_event(api_client, user, event):
         data=data,
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_register_twice_for_event(api_client, user, event_2, fixed_datetime):
+    event_2.attendees.add(user)
+    event_2.capacity = 5
+    event_2.save()
+    response = api_client.post(
+        reverse("event-register", args=[event_2.id]),
+        headers=get_auth_headers(user),
+        data={"register": True},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert event_2.attendees.count() == 1
+
+
+@pytest.mark.django_db
+def test_unregister_not_registered_user(api_client, user, event_2, fixed_datetime):
+    response = api_client.post(
+        reverse("event-register", args=[event_2.id]),
+        headers=get_auth_headers(user),
+        data={"register": False},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_register_query_count(user, event_2, fixed_datetime):
+    event_2.refresh_from_db()
+    for register in (True, False):
+        with CaptureQueriesContext(connection) as context:
+            handle_event_registration(event_2, user, register=register)
+        statements = [
+            query["sql"]
+            for query in context.captured_queries
+            if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))
+        ]
+        assert len(statements) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_registrations_do_not_exceed_capacity(user, fixed_datetime):
+    capacity = 5
+    event = Event.objects.create(
+        name="popular event",
+        description="description",
+        start_date="2024-02-01",
+        end_date="2024-02-02",
+        owner=user,
+        capacity=capacity,
+    )
+    event.refresh_from_db()
+    users = User.objects.bulk_create(
+        [User(username=f"attendee{i}") for i in range(30)]
+    )
+    barrier = threading.Barrier(len(users))
+    results = []
+
+    def register(attendee):
+        barrier.wait()
+        try:
+            while True:
+                try:
+                    results.append(
+                        handle_event_registration(event, attendee, register=True)
+                    )
+                    return
+                except ValidationError:
+                    return
+                except OperationalError:
+                    # Shared-cache in-memory test databases report lock contention
+                    # as an error instead of waiting, so the writer simply retries.
+                    time.sleep(0.001)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=register, args=(u,)) for u in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == capacity
+    assert event.attendees.count() == capacity
+
+
+@pytest.mark.django_db
+def test_attendee_count_follows_registrations(
+    api_client, user, user3, event_2, fixed_datetime
+):
+    event_2.capacity = 5
+    event_2.save()
+    event_2.attendees.add(user)
+    api_client.post(
+        reverse("event-register", args=[event_2.id]),
+        headers=get_auth_headers(user3),
+        data={"register": True},
+    )
+    event_2.refresh_from_db()
+    assert event_2.attendee_count == 2
+
+    event_2.attendees.remove(user)
+    api_client.post(
+        reverse("event-register", args=[event_2.id]),
+        headers=get_auth_headers(user3),
+        data={"register": False},
+    )
+    event_2.refresh_from_db()
+    assert event_2.attendee_count == 0
+
+
+@pytest.mark.django_db
+def test_attendee_count_follows_reverse_relation_and_user_delete(
+    user, user3, event, event_2
+):
+    user3.attending_events.add(event, event_2)
+    user.attending_events.add(event_2)
+    user3.attending_events.clear()
+    event.refresh_from_db()
+    event_2.refresh_from_db()
+    assert (event.attendee_count, event_2.attendee_count) == (0, 1)
+
+    user.delete()
+    assert Event.objects.get(pk=event_2.pk).attendee_count == 0
+
+
+@pytest.mark.django_db
+def test_recount_attendees_command_repairs_drift(user2, user3, event):
+    event.attendees.add(user2, user3)
+    Event.objects.filter(pk=event.pk).update(attendee_count=7)
+    call_command("recount_attendees", stdout=StringIO())
+    event.refresh_from_db()
+    assert event.attendee_count == 2
+
+
+@pytest.mark.django_db
+def test_seed_events_command():
+    call_command("seed_events", users=30, events=200, seed=1, stdout=StringIO())
+
+    assert User.objects.filter(username__startswith="loadtest").count() == 30
+    assert Event.objects.count() == 200
+    assert not Event.objects.filter(attendees=F("owner")).exists()
+    assert not Event.objects.filter(attendee_count__gt=F("capacity")).exists()
+    drift = StringIO()
+    call_command("recount_attendees", dry_run=True, stdout=drift)
+    assert "All attendee counters are correct." in drift.getvalue()
+
+
+def create_events(owner, count: int) -> list[Event]:
+    return Event.objects.bulk_create(
+        Event(
+            name=f"event{index}",
+            description="description",
+            start_date="2024-01-01",
+            end_date="2024-01-02",
+            owner=owner,
+        )
+        for index in range(count)
+    )
+
+
+@pytest.mark.django_db
+def test_export_events_ndjson(api_client, user, user2, user3, event, event_2):
+    event.attendees.add(user2, user3)
+    url = reverse("event-export", kwargs={"export_format": "ndjson"})
+    response = api_client.get(f"{url}?owner={user.id}", headers=get_auth_headers(user))
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert response.streaming
+
+    content = b"".join(response.streaming_content)
+    rows = [json.loads(line) for line in content.splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["id"] == event.id
+    assert rows[0]["owner_id"] == user.id
+    assert rows[0]["start_date"] == "2023-01-01"
+    assert rows[0]["attendees"] == [user2.id, user3.id]
+
+
+@pytest.mark.django_db
+def test_export_events_csv(api_client, user, user2, event, event_2):
+    event_2.attendees.add(user)
+    response = api_client.get(
+        reverse("event-export", kwargs={"export_format": "csv"}),
+        headers=get_auth_headers(user),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/csv"
+
+    content = b"".join(response.streaming_content).decode()
+    rows = list(csv.DictReader(content.splitlines()))
+    assert [row["name"] for row in rows] == [event.name, event_2.name]
+    assert rows[0]["attendees"] == ""
+    assert rows[1]["attendees"] == str(user.id)
+    assert rows[1]["capacity"] == "1"
+
+
+@pytest.mark.django_db
+def test_export_events_streams_in_chunks(api_client, user, user2, settings):
+    settings.EXPORT_CHUNK_SIZE = 2
+    events = create_events(user, 5)
+    events[4].attendees.add(user2)
+    response = api_client.get(
+        reverse("event-export", kwargs={"export_format": "ndjson"}),
+        headers=get_auth_headers(user),
+    )
+    content = iter(response.streaming_content)
+
+    # The first chunk costs one query for the events and one for their attendees,
+    # whatever the size of the export.
+    with CaptureQueriesContext(connection) as queries:
+        first_chunk = next(content)
+    assert len(queries) == 2
+    assert len(first_chunk.splitlines()) == 2
+
+    with CaptureQueriesContext(connection) as queries:
+        rest = b"".join(content)
+    assert len(queries) == 4
+    rows = [json.loads(line) for line in rest.splitlines()]
+    assert [row["id"] for row in rows] == [event.id for event in events[2:]]
+    assert rows[-1]["attendees"] == [user2.id]
+
+
+@pytest.mark.django_db
+def test_export_events_under_asgi(user, user2, event):
+    event.attendees.add(user2)
+
+    async def export() -> tuple:
+        response = await AsyncClient().get(
+            reverse("event-export", kwargs={"export_format": "ndjson"}),
+            headers=get_auth_headers(user),
+        )
+        return response, [chunk async for chunk in response.streaming_content]
+
+    response, content = async_to_sync(export)()
+    assert response.status_code == status.HTTP_200_OK
+    assert response.is_async
+    assert json.loads(b"".join(content))["attendees"] == [user2.id]
+
+
+@pytest.mark.django_db
+def test_export_events_memory_does_not_grow(user, settings):
+    settings.EXPORT_CHUNK_SIZE = 100
+
+    def peak_memory() -> int:
+        tracemalloc.start()
+        try:
+            call_command("export_events", output=os.devnull)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    create_events(user, 200)
+    peak_memory()  # Warm up imports and caches.
+    small = peak_memory()
+    create_events(user, 2000)
+    large = peak_memory()
+    assert large < small * 1.5
+
+
+@pytest.mark.django_db
+def test_export_events_command(user, user2, event, event_2, tmp_path):
+    output = tmp_path / "events.csv"
+    call_command(
+        "export_events", format="csv", output=str(output), filter=[f"owner={user2.id}"]
+    )
+    rows = list(csv.DictReader(output.read_text().splitlines()))
+    assert [row["id"] for row in rows] == [str(event_2.id)]
+
+    stdout = StringIO()
+    call_command("export_events", stdout=stdout)
+    assert [json.loads(line)["id"] for line in stdout.getvalue().splitlines()] == [
+        event.id,
+        event_2.id,
+    ]
+
+
+def write_jsonl(path, rows: list) -> None:
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+
+
+def event_row(**fields) -> dict:
+    return {
+        "name": "imported",
+        "description": "description",
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-02",
+        **fields,
+    }
+
+
+@pytest.mark.django_db
+def test_import_events_command(user, user2, user3, tmp_path):
+    path = tmp_path / "events.jsonl"
+    write_jsonl(
+        path,
+        [
+            event_row(owner="user1", attendees=[user2.id], attendee_usernames="user3"),
+            event_row(owner_id=user2.id, capacity=1, attendees=[user3.id, user3.id]),
+            event_row(owner="user1", end_date="2023-12-31"),
+            event_row(owner="unknown"),
+            event_row(owner="user1", attendees=[user.id]),
+            event_row(owner="user1", capacity=1, attendees=[user2.id, user3.id]),
+            event_row(attendees=[user2.id]),
+        ],
+    )
+    stdout, stderr = StringIO(), StringIO()
+    with CaptureQueriesContext(connection) as queries:
+        call_command("import_events", str(path), stdout=stdout, stderr=stderr)
+
+    assert "7 rows processed, 2 events imported, 5 rejected" in stdout.getvalue()
+    errors = stderr.getvalue().splitlines()
+    assert [error.split(":")[0] for error in errors] == [
+        "Line 3", "Line 4", "Line 5", "Line 6", "Line 7"
+    ]
+    assert "End date cannot be before start date." in errors[0]
+    assert "unknown" in errors[1]
+    # One lookup of the user IDs, one of the usernames, one insert per table, and
+    # the lookup and creation of the import progress.
+    assert sum(query["sql"].startswith(("SELECT", "INSERT")) for query in queries) == 6
+
+    first, second = Event.objects.order_by("pk")
+    assert first.owner == user
+    assert set(first.attendees.values_list("pk", flat=True)) == {user2.id, user3.id}
+    assert (second.owner, second.attendee_count) == (user2, 1)
+    drift = StringIO()
+    call_command("recount_attendees", dry_run=True, stdout=drift)
+    assert "All attendee counters are correct." in drift.getvalue()
+    assert not ImportProgress.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_events_from_csv_export(user, user2, user3, event, event_2, tmp_path):
+    event.attendees.add(user2, user3)
+    path = tmp_path / "events.csv"
+    call_command("export_events", format="csv", output=str(path))
+
+    call_command("import_events", str(path), stdout=StringIO())
+    assert Event.objects.count() == 4
+    imported = Event.objects.exclude(pk__in=[event.pk, event_2.pk]).order_by("pk")
+    assert [(e.name, e.owner_id, e.capacity, e.attendee_count) for e in imported] == [
+        (event.name, user.id, 100, 2),
+        (event_2.name, user2.id, 1, 0),
+    ]
+
+
+@pytest.mark.django_db
+def test_import_events_resumes_after_last_batch(user, tmp_path):
+    path = tmp_path / "events.jsonl"
+    rows = [event_row(name=f"event{index}", owner="user1") for index in range(6)]
+    write_jsonl(path, rows)
+    with path.open("a") as file:
+        file.write("{broken\n")
+
+    with pytest.raises(CommandError):
+        call_command("import_events", str(path), batch_size=2, stdout=StringIO())
+    assert Event.objects.count() == 6
+    assert ImportProgress.objects.get(source=str(path.resolve())).rows == 6
+
+    write_jsonl(path, rows + [event_row(name="event6", owner="user1")])
+    stdout = StringIO()
+    call_command("import_events", str(path), batch_size=2, stdout=stdout)
+    assert "Resuming after 6 rows." in stdout.getvalue()
+    assert list(Event.objects.order_by("pk").values_list("name", flat=True)) == [
+        f"event{index}" for index in range(7)
+    ]
+    assert not ImportProgress.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_events_crash_does_not_duplicate_batch(user, tmp_path, monkeypatch):
+    path = tmp_path / "events.jsonl"
+    write_jsonl(
+        path, [event_row(name=f"event{index}", owner="user1") for index in range(4)]
+    )
+    save = ImportProgress.save
+
+    def crash_on_second_batch(progress, *args, **kwargs):
+        if progress.rows == 4:
+            raise RuntimeError("crash")
+        save(progress, *args, **kwargs)
+
+    monkeypatch.setattr(ImportProgress, "save", crash_on_second_batch)
+    with pytest.raises(RuntimeError):
+        call_command("import_events", str(path), batch_size=2, stdout=StringIO())
+    # The second batch is rolled back together with its progress.
+    assert Event.objects.count() == 2
+    assert ImportProgress.objects.get().rows == 2
+
+    monkeypatch.setattr(ImportProgress, "save", save)
+    call_command("import_events", str(path), batch_size=2, stdout=StringIO())
+    assert list(Event.objects.order_by("pk").values_list("name", flat=True)) == [
+        f"event{index}" for index in range(4)
+    ]
+
+
+@pytest.mark.django_db
+def test_list_events_filter_by_availability(
+    api_client, user, user3, event, event_2, fixed_datetime
+):
+    event_2.attendees.add(user3)
+    response = api_client.get(
+        reverse("event-list") + "?available=true&ordering=-attendee_count",
+        headers=get_auth_headers(user),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [e["name"] for e in response.data["results"]] == [event.name]
+
+
+@pytest.mark.django_db
+def test_list_events_compact_representation(api_client, user, user3, event):
+    event.attendees.add(user3)
+    response = api_client.get(reverse("event-list"), headers=get_auth_headers(user))
+    assert response.status_code == status.HTTP_200_OK
+    assert "attendees" not in response.data["results"][0]
+    assert response.data["results"][0]["attendee_count"] == 1
+
+    response = api_client.get(
+        reverse("event-list") + "?expand=attendees", headers=get_auth_headers(user)
+    )
+    assert response.data["results"][0]["attendees"] == [user3.id]
+
+
+@pytest.mark.django_db
+def test_retrieve_event_compact_representation(
+    api_client, user, user2, user3, event, django_assert_num_queries
+):
+    headers = get_auth_headers(user)
+    url = reverse("event-detail", args=[event.id])
+    for attendee in (user2, user3):
+        event.attendees.add(attendee)
+        api_client.get(url, headers=headers)
+        # The size and the cost of the response do not depend on the attendees.
+        with django_assert_num_queries(2):
+            response = api_client.get(url, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert "attendees" not in response.data
+
+    assert response.data["attendee_count"] == 2
+    response = api_client.get(url + "?expand=attendees", headers=headers)
+    assert response.data["attendees"] == [user2.id, user3.id]
+
+
+@pytest.mark.django_db
+def test_list_event_attendees(api_client, user, user2, event, django_assert_num_queries):
+    attendees = User.objects.bulk_create(
+        User(username=f"attendee{index}") for index in range(5)
+    )
+    event.attendees.add(*attendees)
+    other_event = Event.objects.create(
+        name="other",
+        description="description",
+        start_date="2023-01-01",
+        end_date="2023-01-02",
+        owner=user,
+    )
+    other_event.attendees.add(user2)
+    headers = get_auth_headers(user)
+
+    url = reverse("event-attendees", args=[event.id]) + "?page_size=2"
+    api_client.get(url, headers=headers)
+    pages = []
+    while url:
+        with django_assert_num_queries(2):
+            response = api_client.get(url, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(response.data["results"])
+        url = response.data["next"]
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [attendee for page in pages for attendee in page] == [
+        {"id": attendee.id, "username": attendee.username} for attendee in attendees
+    ]
+
+    response = api_client.get(reverse("event-attendees", args=[9999]), headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_list_event_attendees_invalid_cursor(api_client, user, user2, event):
+    event.attendees.add(user2)
+    url = reverse("event-attendees", args=[event.id])
+    headers = get_auth_headers(user)
+    for position in (["x"], [None], [[1]]):
+        cursor = urlsafe_b64encode(
+            json.dumps({"o": ["user_id"], "p": position, "r": False}).encode()
+        ).decode()
+        response = api_client.get(url, {"cursor": cursor}, headers=headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND, position
+
+
+@pytest.mark.django_db
+def test_list_attending_events(
+    api_client, user, user2, user3, event, event_2, fixed_datetime,
+    django_assert_num_queries,
+):
+    event.attendees.add(user3)
+    event_2.attendees.add(user3, user)
+    headers = get_auth_headers(user3)
+    url = reverse("event-attending")
+    api_client.get(url, headers=headers)
+
+    with django_assert_num_queries(1):
+        response = api_client.get(url, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert [e["name"] for e in response.data["results"]] == [event.name, event_2.name]
+    assert "attendees" not in response.data["results"][0]
+
+    response = api_client.get(url + "?status=future", headers=headers)
+    assert [e["name"] for e in response.data["results"]] == [event_2.name]
+    response = api_client.get(url + "?status=past", headers=headers)
+    assert [e["name"] for e in response.data["results"]] == [event.name]
+
+    response = api_client.get(url + "?page_size=1", headers=headers)
+    assert [e["name"] for e in response.data["results"]] == [event.name]
+    response = api_client.get(response.data["next"], headers=headers)
+    assert [e["name"] for e in response.data["results"]] == [event_2.name]
+
+    response = api_client.get(url, headers=get_auth_headers(user2))
+    assert response.data["results"] == []
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_list_owned_events_endpoint(
+    api_client, user, user2, event, event_2, fixed_datetime, django_assert_num_queries
+):
+    headers = get_auth_headers(user2)
+    url = reverse("event-owned")
+    api_client.get(url, headers=headers)
+
+    with django_assert_num_queries(1):
+        response = api_client.get(url, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert [e["name"] for e in response.data["results"]] == [event_2.name]
+
+    response = api_client.get(url + "?status=past", headers=headers)
+    assert response.data["results"] == []
+    response = api_client.get(url + "?status=past", headers=get_auth_headers(user))
+    assert [e["name"] for e in response.data["results"]] == [event.name]
+
+
+def search(api_client, user, text: str, **params) -> list[str]:
+    response = api_client.get(
+        reverse("event-list"), {"q": text, **params}, headers=get_auth_headers(user)
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return [event["name"] for event in response.data["results"]]
+
+
+@pytest.mark.django_db
+def test_search_events(api_client, user):
+    for name, description in [
+        ("Python meetup", "Talks about Django and asyncio."),
+        ("Board games", "Bring your own Python snacks."),
+        ("Jazz night", "Live music."),
+    ]:
+        Event.objects.create(
+            name=name,
+            description=description,
+            start_date="2024-01-01",
+            end_date="2024-01-02",
+            owner=user,
+        )
+
+    # Matches in the name rank above matches in the description.
+    assert search(api_client, user, "python") == ["Python meetup", "Board games"]
+    assert search(api_client, user, "pyth") == ["Python meetup", "Board games"]
+    assert search(api_client, user, "python snacks") == ["Board games"]
+    assert search(api_client, user, "asyncio") == ["Python meetup"]
+    assert search(api_client, user, "rock") == []
+    assert search(api_client, user, 'jazz" OR "python') == []
+    assert search(api_client, user, "*") == [
+        "Python meetup", "Board games", "Jazz night"
+    ]
+    # An explicit ordering replaces the ranking.
+    assert search(api_client, user, "python", ordering="-start_date") == [
+        "Board games", "Python meetup"
+    ]
+    assert search(api_client, user, "python", page_size=1) == ["Python meetup"]
+
+
+@pytest.mark.django_db
+def test_search_events_pagination(api_client, user):
+    Event.objects.bulk_create(
+        Event(
+            name="conference " + "python " * (index % 3),
+            description="description",
+            start_date="2024-01-01",
+            end_date="2024-01-02",
+            owner=user,
+        )
+        for index in range(7)
+    )
+    url = reverse("event-list") + "?q=python&page_size=2"
+    names = []
+    while url:
+        response = api_client.get(url, headers=get_auth_headers(user))
+        names += [event["name"] for event in response.data["results"]]
+        url = response.data["next"]
+    assert names == ["conference python python "] * 2 + ["conference python "] * 2
+
+
+@pytest.mark.django_db
+def test_search_short_words_match_whole_words(api_client, user):
+    for name in ("a b c", "abc"):
+        Event.objects.create(
+            name=name,
+            description="description",
+            start_date="2024-01-01",
+            end_date="2024-01-02",
+            owner=user,
+        )
+    assert build_match_query("a bc") == '"a" "bc"*'
+    assert search(api_client, user, "a") == ["a b c"]
+    assert search(api_client, user, "ab") == ["abc"]
+
+
+@pytest.mark.django_db
+def test_search_broad_query_lists_newest_first(api_client, user, settings):
+    settings.EVENTS_LIST_CACHE_TIMEOUT = 0
+    settings.SEARCH_RANK_LIMIT = 3
+    create_events(user, 5)
+    expected = [f"event{index}" for index in reversed(range(5))]
+
+    url = reverse("event-list") + "?q=description&page_size=2"
+    names = []
+    while url:
+        response = api_client.get(url, headers=get_auth_headers(user))
+        names += [event["name"] for event in response.data["results"]]
+        url = response.data["next"]
+    assert names == expected
+    assert "ETag" not in response.headers
+    settings.EVENTS_LIST_CACHE_TIMEOUT = 300
+    for _ in range(2):
+        response = api_client.get(
+            reverse("event-list") + "?q=description", headers=get_auth_headers(user)
+        )
+        assert len(response.data["results"]) == 5
+    # Queries within the limit are still ranked.
+    assert search(api_client, user, "event3") == ["event3"]
+    assert search(api_client, user, "description", ordering="start_date") == [
+        f"event{index}" for index in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_search_index_follows_writes(api_client, user, event, settings):
+    settings.EVENTS_LIST_CACHE_TIMEOUT = 0
+    assert search(api_client, user, "event1") == ["event1"]
+
+    response = api_client.patch(
+        reverse("event-detail", args=[event.id]),
+        {"name": "renamed"},
+        headers=get_auth_headers(user),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert search(api_client, user, "event1") == []
+    assert search(api_client, user, "renamed") == ["renamed"]
+
+    create_events(user, 2)
+    assert search(api_client, user, "event0") == ["event0"]
+    event.delete()
+    assert search(api_client, user, "renamed") == []
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index_command(api_client, user, event, settings):
+    settings.EVENTS_LIST_CACHE_TIMEOUT = 0
+    # A migration that rebuilds the events table drops the triggers.
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TRIGGER events_event_fts_insert")
+    create_events(user, 1)
+    assert search(api_client, user, "event0") == []
+
+    stdout = StringIO()
+    call_command("rebuild_search_index", optimize=True, stdout=stdout)
+    assert "Indexed 2 events." in stdout.getvalue()
+    assert search(api_client, user, "event0") == ["event0"]
+    create_events(user, 1)
+    assert search(api_client, user, "event0") == ["event0", "event0"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query, budget", [("", 2), ("?expand=attendees", 3)])
+def test_list_events_query_budget(
+    api_client, user, user2, user3, query, budget, django_assert_num_queries, settings
+):
+    settings.EVENTS_LIST_CACHE_TIMEOUT = 0
+    headers = get_auth_headers(user)
+    for number_of_events in (2, 20):
+        Event.objects.bulk_create(
+            Event(
+                name=f"event{i}",
+                description="description",
+                start_date="2024-02-01",
+                end_date="2024-02-02",
+                owner=user,
+            )
+            for i in range(number_of_events)
+        )
+        for event in Event.objects.all():
+            event.attendees.add(user2, user3)
+        api_client.get(reverse("event-list"), headers=headers)
+        with django_assert_num_queries(budget):
+            api_client.get(reverse("event-list") + query, headers=headers)
+
+
+@pytest.mark.django_db
+def test_list_events_keyset_pagination(api_client, user, user2):
+    Event.objects.bulk_create(
+        Event(
+            name=f"event{i}",
+            description="description",
+            start_date=f"2024-02-0{i % 3 + 1}",
+            end_date="2024-02-05",
+            owner=user if i % 2 else user2,
+        )
+        for i in range(9)
+    )
+    expected = list(
+        Event.objects.filter(owner=user2)
+        .order_by("start_date", "id")
+        .values_list("id", flat=True)
+    )
+    url = reverse("event-list") + f"?owner={user2.id}&page_size=2"
+    headers = get_auth_headers(user)
+
+    pages = []
+    while url:
+        response = api_client.get(url, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(response.data)
+        url = response.data["next"]
+    assert [e["id"] for page in pages for e in page["results"]] == expected
+    assert pages[0]["previous"] is None
+
+    response = api_client.get(pages[-1]["previous"], headers=headers)
+    assert response.data["results"] == pages[-2]["results"]
+
+
+@pytest.mark.django_db
+def test_list_events_invalid_cursor(api_client, user):
+    response = api_client.get(
+        reverse("event-list") + "?cursor=garbage", headers=get_auth_headers(user)
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_list_events_cursor_with_invalid_position(api_client, user, event):
+    headers = get_auth_headers(user)
+    for position in (["notadate", 1], ["2024-01-01", "x"], [None, 1], [{}, 1]):
+        cursor = urlsafe_b64encode(
+            json.dumps({"o": ["start_date", "pk"], "p": position, "r": False}).encode()
+        ).decode()
+        response = api_client.get(
+            reverse("event-list"), {"cursor": cursor}, headers=headers
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND, position
+
+    cursor = urlsafe_b64encode(
+        json.dumps({"o": ["start_date", "pk"], "p": ["2000-01-01", "0"], "r": False})
+        .encode()
+    ).decode()
+    response = api_client.get(
+        reverse("event-list"), {"cursor": cursor}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [e["id"] for e in response.data["results"]] == [event.id]
+
+
+@pytest.mark.django_db
+def test_bulk_register_for_events(
+    api_client, user, user2, user3, event, event_2, fixed_datetime
+):
+    future_event = Event.objects.create(
+        name="event3",
+        description="description",
+        start_date="2024-03-01",
+        end_date="2024-03-02",
+        owner=user2,
+    )
+    event_2.attendees.add(user3)
+    data = {
+        "registrations": [
+            {"event": future_event.id, "register": True},
+            {"event": event.id, "register": True},
+            {"event": event_2.id, "register": True},
+            {"event": 9999, "register": True},
+        ]
+    }
+    response = api_client.post(
+        reverse("event-bulk-register"),
+        headers=get_auth_headers(user),
+        data=data,
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [r["success"] for r in response.data["results"]] == [
+        True,
+        False,
+        False,
+        False,
+    ]
+    assert list(user.attending_events.all()) == [future_event]
+    future_event.refresh_from_db()
+    assert future_event.attendee_count == 1
+
+    data = {"registrations": [{"event": future_event.id, "register": False}]}
+    response = api_client.post(
+        reverse("event-bulk-register"),
+        headers=get_auth_headers(user),
+        data=data,
+        format="json",
+    )
+    assert response.data["results"][0]["success"]
+    future_event.refresh_from_db()
+    assert future_event.attendee_count == 0
+
+
+@pytest.mark.django_db
+def test_bulk_register_query_count(user, user2, fixed_datetime):
+    Event.objects.bulk_create(
+        Event(
+            name=f"event{i}",
+            description="description",
+            start_date="2024-02-01",
+            end_date="2024-02-02",
+            owner=user2,
+        )
+        for i in range(50)
+    )
+    items = [
+        {"event": event_id, "register": True}
+        for event_id in Event.objects.values_list("id", flat=True)
+    ]
+    with CaptureQueriesContext(connection) as context:
+        results = handle_bulk_event_registration(user, items)
+    assert all(result["success"] for result in results)
+    assert user.attending_events.count() == 50
+    assert len(context.captured_queries) <= 6
+
+
+@pytest.mark.django_db
+def test_bulk_register_full_event_among_free_ones(
+    user, user2, user3, event_2, fixed_datetime
+):
+    free_event = Event.objects.create(
+        name="event3",
+        description="description",
+        start_date="2024-03-01",
+        end_date="2024-03-02",
+        owner=user2,
+        capacity=1,
+    )
+    event_2.attendees.add(user3)
+    items = [
+        {"event": event_2.id, "register": True},
+        {"event": free_event.id, "register": True},
+    ]
+    results = handle_bulk_event_registration(user, items)
+    assert [r["message"] for r in results] == [
+        CAPACITY_MESSAGE,
+        "Registered successfully.",
+    ]
+    assert list(user.attending_events.all()) == [free_event]
+    assert Event.objects.get(pk=event_2.id).attendee_count == 1
+    assert Event.objects.get(pk=free_event.id).attendee_count == 1
+
+
+@pytest.mark.django_db
+def test_bulk_register_attendees(api_client, user, user2, user3, fixed_datetime):
+    event = Event.objects.create(
+        name="event3",
+        description="description",
+        start_date="2024-03-01",
+        end_date="2024-03-02",
+        owner=user2,
+        capacity=3,
+    )
+    data = {
+        "registrations": [
+            {"user": user.id, "register": True},
+            {"user": user3.id, "register": True},
+            {"user": 9999, "register": True},
+            {"user": user2.id, "register": True},
+            {"user": user.id, "register": True},
+        ]
+    }
+    response = api_client.post(
+        reverse("event-bulk-register-attendees", args=[event.id]),
+        headers=get_auth_headers(user2),
+        data=data,
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [(r["user"], r["success"]) for r in response.data["results"]] == [
+        (user.id, True),
+        (user3.id, True),
+        (9999, False),
+        (user2.id, False),
+        (user.id, False),
+    ]
+    assert set(event.attendees.all()) == {user, user3}
+    event.refresh_from_db()
+    assert event.attendee_count == 2
+
+    data = {"registrations": [{"user": user3.id, "register": False}]}
+    response = api_client.post(
+        reverse("event-bulk-register-attendees", args=[event.id]),
+        headers=get_auth_headers(user2),
+        data=data,
+        format="json",
+    )
+    assert response.data["results"][0]["success"]
+    event.refresh_from_db()
+    assert event.attendee_count == 1
+
+
+@pytest.mark.django_db
+def test_bulk_register_attendees_over_capacity(
+    api_client, user, user2, user3, event_2, fixed_datetime
+):
+    data = {
+        "registrations": [
+            {"user": user.id, "register": True},
+            {"user": user3.id, "register": True},
+        ]
+    }
+    response = api_client.post(
+        reverse("event-bulk-register-attendees", args=[event_2.id]),
+        headers=get_auth_headers(user2),
+        data=data,
+        format="json",
+    )
+    assert [r["message"] for r in response.data["results"]] == [
+        CAPACITY_MESSAGE,
+        CAPACITY_MESSAGE,
+    ]
+    assert not event_2.attendees.exists()
+
+    # The place freed by an unregistration is taken by a registration of the batch.
+    event_2.attendees.add(user)
+    data = {
+        "registrations": [
+            {"user": user3.id, "register": True},
+            {"user": user.id, "register": False},
+        ]
+    }
+    response = api_client.post(
+        reverse("event-bulk-register-attendees", args=[event_2.id]),
+        headers=get_auth_headers(user2),
+        data=data,
+        format="json",
+    )
+    assert all(r["success"] for r in response.data["results"])
+    assert list(event_2.attendees.all()) == [user3]
+    event_2.refresh_from_db()
+    assert event_2.attendee_count == 1
+
+
+@pytest.mark.django_db
+def test_bulk_register_attendees_not_owner(api_client, user, user3, event_2):
+    data = {"registrations": [{"user": user3.id, "register": True}]}
+    response = api_client.post(
+        reverse("event-bulk-register-attendees", args=[event_2.id]),
+        headers=get_auth_headers(user),
+        data=data,
+        format="json",
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert not event_2.attendees.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_register_attendees_for_past_event(api_client, user, user2, event):
+    data = {"registrations": [{"user": user2.id, "register": True}]}
+    response = api_client.post(
+        reverse("event-bulk-register-attendees", args=[event.id]),
+        headers=get_auth_headers(user),
+        data=data,
+        format="json",
+    )
+    assert response.data["results"][0]["message"] == PAST_EVENT_MESSAGE
+    assert not event.attendees.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_create_events(api_client, user):
+    data = [
+        {
+            "name": f"event{i}",
+            "description": "description",
+            "start_date": "2024-02-01",
+            "end_date": "2024-02-02",
+        }
+        for i in range(10_000)
+    ]
+    response = api_client.post(
+        reverse("event-bulk"), headers=get_auth_headers(user), data=data, format="json"
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.data["ids"]) == 10_000
+    assert Event.objects.filter(owner=user).count() == 10_000
+
+
+@pytest.mark.django_db
+def test_bulk_create_events_invalid_dates(api_client, user):
+    data = [
+        {
+            "name": "event",
+            "description": "description",
+            "start_date": "2024-02-02",
+            "end_date": "2024-02-01",
+        }
+    ]
+    response = api_client.post(
+        reverse("event-bulk"), headers=get_auth_headers(user), data=data, format="json"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert Event.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_bulk_update_events(api_client, user, event, event_2):
+    data = [{"id": event.id, "name": "renamed", "capacity": 3}]
+    response = api_client.patch(
+        reverse("event-bulk"), headers=get_auth_headers(user), data=data, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    event.refresh_from_db()
+    assert (event.name, event.capacity) == ("renamed", 3)
+
+    data = [
+        {"id": event.id, "end_date": "2022-01-01"},
+        {"id": event_2.id, "name": "not mine"},
+    ]
+    response = api_client.patch(
+        reverse("event-bulk"), headers=get_auth_headers(user), data=data, format="json"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    event_2.refresh_from_db()
+    assert event_2.name == "event2"
+
+
+@pytest.mark.django_db
+def test_list_events_conditional_get(
+    api_client, user, user3, event, django_assert_num_queries, settings
+):
+    # A cached page answers without any query, this checks the uncached path.
+    settings.EVENTS_LIST_CACHE_TIMEOUT = 0
+    future_event = Event.objects.create(
+        name="future event",
+        description="description",
+        start_date="2999-01-01",
+        end_date="2999-01-02",
+        owner=user3,
+    )
+    headers = get_auth_headers(user)
+    response = api_client.get(reverse("event-list"), headers=headers)
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    # The validators come from one aggregate, the page is neither read nor serialized.
+    with django_assert_num_queries(1) as context:
+        response = api_client.get(
+            reverse("event-list"), headers={**headers, "If-None-Match": etag}
+        )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert "COUNT" in context.captured_queries[0]["sql"]
+    response = api_client.get(
+        reverse("event-list"), headers={**headers, "If-Modified-Since": last_modified}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    future_event.refresh_from_db()
+    handle_event_registration(future_event, user, register=True)
+    response = api_client.get(
+        reverse("event-list"), headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+    etag = response.headers["ETag"]
+    event.delete()
+    response = api_client.get(
+        reverse("event-list"), headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_retrieve_event_conditional_get(api_client, user, event):
+    headers = get_auth_headers(user)
+    response = api_client.get(
+        reverse("event-detail", args=[event.id]), headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = api_client.get(
+        reverse("event-detail", args=[event.id]),
+        headers={**headers, "If-Modified-Since": response.headers["Last-Modified"]},
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = api_client.get(reverse("event-detail", args=["abc"]), headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_list_events_cache(
+    api_client, user, user3, event, event_2, fixed_datetime, django_assert_num_queries
+):
+    headers = get_auth_headers(user)
+    owned_url = reverse("event-list") + f"?owner={user.id}"
+    api_client.get(reverse("event-list"), headers=headers)
+    api_client.get(owned_url, headers=headers)
+
+    with django_assert_num_queries(0):
+        response = api_client.get(reverse("event-list"), headers=headers)
+        api_client.get(owned_url, headers=headers)
+    assert len(response.data["results"]) == 2
+    assert event_list_cache.stats()["-"] == {"hits": 1, "misses": 1}
+
+    # A registration for another owner's event leaves the owned list cached.
+    handle_event_registration(Event.objects.get(pk=event_2.pk), user3, register=True)
+    with django_assert_num_queries(0):
+        api_client.get(owned_url, headers=headers)
+    response = api_client.get(reverse("event-list"), headers=headers)
+    assert response.data["results"][1]["attendee_count"] == 1
+
+    event.delete()
+    response = api_client.get(owned_url, headers=headers)
+    assert response.data["results"] == []
+
+
+@pytest.mark.django_db
+def test_list_events_cache_generation_evicted(
+    api_client, user, user3, event_2, fixed_datetime
+):
+    headers = get_auth_headers(user)
+    api_client.get(reverse("event-list"), headers=headers)
+    handle_event_registration(Event.objects.get(pk=event_2.pk), user3, register=True)
+
+    # A generation evicted after a write is replaced by a new value, so the page
+    # cached before the write is not served again.
+    event_list_cache.cache.delete(f"{event_list_cache.prefix}:gen:all")
+    response = api_client.get(reverse("event-list"), headers=headers)
+    assert response.data["results"][0]["attendee_count"] == 1
@@ -0,0 +1,113 @@
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+
+from tests.integration.utils.auth_utils import get_auth_headers
+
+pytest_plugins = ["tests.integration.utils.fixtures"]
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint(api_client, user, event):
+    api_client.get(reverse("event-list"), headers=get_auth_headers(user))
+
+    response = api_client.get(reverse("metrics"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert (
+        'http_request_duration_seconds_count{method="GET",status="200",'
+        'view="EventViewSet.list"}'
+    ) in body
+    assert "http_requests_in_flight" in body
+
+
+@pytest.mark.django_db
+def test_request_metrics_by_view(api_client, user, event):
+    labels = {"view": "EventViewSet.retrieve", "method": "GET", "status": "200"}
+    requests = sample("http_request_duration_seconds_count", **labels)
+    queries = sample("db_queries_total", view="EventViewSet.retrieve")
+
+    api_client.get(
+        reverse("event-detail", args=[event.id]), headers=get_auth_headers(user)
+    )
+
+    assert sample("http_request_duration_seconds_count", **labels) == requests + 1
+    assert sample("db_queries_total", view="EventViewSet.retrieve") == queries + 3
+
+
+@pytest.mark.django_db
+def test_token_validation_metrics(api_client, user, event):
+    valid = sample("token_validations_total", token_type="access", outcome="valid")
+    invalid = sample("token_validations_total", token_type="access", outcome="invalid")
+
+    api_client.get(reverse("event-list"), headers=get_auth_headers(user))
+    api_client.get(reverse("event-list"), headers={"Authorization": "Bearer broken"})
+
+    assert (
+        sample("token_validations_total", token_type="access", outcome="valid")
+        == valid + 1
+    )
+    assert (
+        sample("token_validations_total", token_type="access", outcome="invalid")
+        == invalid + 1
+    )
+
+
+@pytest.mark.django_db
+def test_token_cache_hit_metrics(api_client, user, event):
+    headers = get_auth_headers(user)
+    api_client.get(reverse("event-list"), headers=headers)
+    valid = sample("token_validations_total", token_type="access", outcome="valid")
+    cached = sample("token_validations_total", token_type="access", outcome="cached")
+
+    api_client.get(reverse("event-list"), headers=headers)
+
+    assert (
+        sample("token_validations_total", token_type="access", outcome="valid")
+        == valid
+    )
+    assert (
+        sample("token_validations_total", token_type="access", outcome="cached")
+        == cached + 1
+    )
+
+
+@pytest.mark.django_db
+def test_event_list_cache_metrics(api_client, user, event):
+    def lookups(scope, result):
+        return sample("event_list_cache_requests_total", scope=scope, result=result)
+
+    misses, hits = lookups("owner", "miss"), lookups("owner", "hit")
+    for _ in range(2):
+        api_client.get(
+            reverse("event-list"), {"owner": user.id}, headers=get_auth_headers(user)
+        )
+
+    assert lookups("owner", "miss") == misses + 1
+    assert lookups("owner", "hit") == hits + 1
+
+
+@pytest.mark.django_db
+def test_registration_rejection_metrics(api_client, user, event, fixed_datetime):
+    past_events = sample("event_registration_rejections_total", reason="past_event")
+
+    response = api_client.post(
+        reverse("event-register", args=[event.id]),
+        {"register": True},
+        headers=get_auth_headers(user),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert (
+        sample("event_registration_rejections_total", reason="past_event")
+        == past_events + 1
+    )
@@ -0,0 +1,76 @@
+import logging
+import re
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from events.views import EventViewSet
+from monitoring.budgets import QueryBudgetExceeded
+from tests.integration.utils.auth_utils import get_auth_headers
+
+pytest_plugins = ["tests.integration.utils.fixtures"]
+
+SERVER_TIMING = re.compile(r'^db;dur=[\d.]+;desc="(\d+) queries", total;dur=[\d.]+$')
+
+
+@pytest.mark.django_db
+def test_server_timing_header(api_client, user, event):
+    response = api_client.get(
+        reverse("event-detail", args=[event.id]), headers=get_auth_headers(user)
+    )
+    assert response.status_code == status.HTTP_200_OK
+    match = SERVER_TIMING.match(response.headers["Server-Timing"])
+    # Token user, last modified and the event.
+    assert match and match.group(1) == "3"
+
+
+@pytest.mark.django_db
+def test_server_timing_header_async(api_client, user, event):
+    response = api_client.get(
+        reverse("async-event-detail", args=[event.id]), headers=get_auth_headers(user)
+    )
+    match = SERVER_TIMING.match(response.headers["Server-Timing"])
+    assert match and match.group(1) == "2"
+
+
+@pytest.mark.django_db
+def test_request_log_fields(api_client, user, event, caplog):
+    with caplog.at_level(logging.INFO, logger="monitoring.requests"):
+        api_client.get(reverse("event-list"), headers=get_auth_headers(user))
+    (record,) = caplog.records
+    assert (record.method, record.path, record.view, record.status) == (
+        "GET",
+        reverse("event-list"),
+        "EventViewSet.list",
+        200,
+    )
+    assert record.db_queries == 3
+    assert record.db_time_ms >= 0 and record.duration_ms >= record.db_time_ms
+
+
+@pytest.mark.django_db
+def test_query_budget_exceeded(api_client, user, event, monkeypatch):
+    monkeypatch.setitem(EventViewSet.query_budget, "retrieve", 2)
+    with pytest.raises(QueryBudgetExceeded) as error:
+        api_client.get(
+            reverse("event-detail", args=[event.id]), headers=get_auth_headers(user)
+        )
+    message = str(error.value)
+    assert message.startswith("EventViewSet.retrieve ran 3 queries")
+    assert "over its budget of 2" in message
+    assert '3. SELECT "events_event"."id"' in message
+
+
+@pytest.mark.django_db
+def test_query_budget_warning_when_not_enforced(
+    api_client, user, event, monkeypatch, settings, caplog
+):
+    settings.QUERY_BUDGET_ENFORCE = False
+    monkeypatch.setitem(EventViewSet.query_budget, "retrieve", 2)
+    with caplog.at_level(logging.WARNING, logger="monitoring.budgets"):
+        response = api_client.get(
+            reverse("event-detail", args=[event.id]), headers=get_auth_headers(user)
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert "EventViewSet.retrieve ran 3 queries" in caplog.text
@@ -0,0 +1,108 @@
+import cProfile
+import pstats
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+
+from monitoring.middleware import ProfilingMiddleware
+from tests.integration.utils.auth_utils import get_auth_headers
+
+pytest_plugins = ["tests.integration.utils.fixtures"]
+
+
+@pytest.fixture
+def profiling(settings, tmp_path):
+    settings.PROFILING_TOKEN = "profile-token"
+    settings.PROFILING_DIR = tmp_path
+    settings.PROFILING_INTERVAL = 0.0001
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_profile_request_with_token(api_client, user, event, profiling):
+    headers = {**get_auth_headers(user), "X-Profile": "profile-token"}
+    response = api_client.get(reverse("event-list"), headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    name = response.headers["X-Profile-Id"]
+    stats = pstats.Stats(str(profiling / f"{name}.pstats"))
+    functions = {function for _, _, function in stats.stats}
+    assert {"has_permission", "dispatch", "execute"} <= functions
+    stacks = (profiling / f"{name}.collapsed").read_text().splitlines()
+    assert stacks
+    for line in stacks:
+        stack, count = line.rsplit(" ", 1)
+        assert "monitoring/middleware.py" in stack and int(count) > 0
+
+
+@pytest.mark.django_db
+def test_no_profile_without_valid_token(api_client, user, event, profiling):
+    for token in (None, "wrong-token"):
+        headers = get_auth_headers(user)
+        if token:
+            headers["X-Profile"] = token
+        response = api_client.get(reverse("event-list"), headers=headers)
+        assert "X-Profile-Id" not in response.headers
+    assert not list(profiling.iterdir())
+
+
+@pytest.mark.django_db
+def test_profile_sampled_requests(api_client, user, event, settings, tmp_path):
+    settings.PROFILING_SAMPLE_RATE = 1
+    settings.PROFILING_DIR = tmp_path
+    settings.PROFILING_MAX_FILES = 2
+    for _ in range(3):
+        response = api_client.get(reverse("event-list"), headers=get_auth_headers(user))
+        assert "X-Profile-Id" in response.headers
+
+    assert len(list(tmp_path.glob("*.pstats"))) == 2
+    assert len(list(tmp_path.glob("*.collapsed"))) == 2
+
+
+def test_profile_one_request_at_a_time(profiling):
+    # Both requests are in flight together, only one of them can be profiled.
+    in_flight = threading.Barrier(2, timeout=5)
+
+    def get_response(request):
+        in_flight.wait()
+        return HttpResponse()
+
+    middleware = ProfilingMiddleware(get_response)
+    request = RequestFactory().get("/api/events/", HTTP_X_PROFILE="profile-token")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        responses = list(executor.map(middleware, [request, request]))
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert sum("X-Profile-Id" in response.headers for response in responses) == 1
+    assert len(list(profiling.glob("*.pstats"))) == 1
+
+    # The profiler is free again once the profiled request is done.
+    response = ProfilingMiddleware(lambda request: HttpResponse())(request)
+    assert "X-Profile-Id" in response.headers
+
+
+def test_profiler_errors_do_not_fail_request(profiling, monkeypatch):
+    def enable(self):
+        raise ValueError("Another profiling tool is already active")
+
+    middleware = ProfilingMiddleware(lambda request: HttpResponse())
+    request = RequestFactory().get("/api/events/", HTTP_X_PROFILE="profile-token")
+    with monkeypatch.context() as patch:
+        patch.setattr(cProfile.Profile, "enable", enable)
+        response = middleware(request)
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+
+    profiling.rmdir()
+    profiling.touch()
+    response = middleware(request)
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+
+    profiling.unlink()
+    assert "X-Profile-Id" in middleware(request).headers
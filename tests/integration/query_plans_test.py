@@ -0,0 +1,143 @@
+import datetime
+import re
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from events.filters import EventFilter
+from events.models import Event
+from events.pagination import AttendeePagination, KeysetPagination
+
+User = get_user_model()
+pytest_plugins = ["tests.integration.utils.fixtures"]
+
+# Walking an index in page order ("SCAN ... USING INDEX") stops after one page,
+# only a bare table scan reads every row.
+FULL_SCAN = re.compile(r"\bSCAN events_event\b(?! USING (COVERING )?INDEX)")
+
+
+@pytest.fixture
+def seeded_events(fixed_datetime):
+    owners = User.objects.bulk_create(User(username=f"owner{i}") for i in range(50))
+    first_day = datetime.date(2023, 1, 1)
+    Event.objects.bulk_create(
+        Event(
+            name=f"event{i}",
+            description="description",
+            start_date=first_day + datetime.timedelta(days=i % 730),
+            end_date=first_day + datetime.timedelta(days=i % 730 + 2),
+            owner=owners[i % len(owners)],
+        )
+        for i in range(5000)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return owners
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite query plans")
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"status": "past"},
+        {"status": "future"},
+        {"start_date": "2024-01-03"},
+        {"end_date": "2024-01-04"},
+        {"owner": "OWNER"},
+        {"owner": "OWNER", "status": "past"},
+        {"owner": "OWNER", "status": "future"},
+        {"owner": "OWNER", "start_date": "2024-01-03"},
+        {"available": "true"},
+        {"available": "false"},
+        {"ordering": "start_date"},
+        {"ordering": "-start_date"},
+        {"ordering": "attendee_count"},
+        {"ordering": "-attendee_count"},
+        {"status": "future", "ordering": "-start_date"},
+        {"status": "future", "ordering": "-attendee_count"},
+        {"available": "true", "ordering": "attendee_count"},
+        {"owner": "OWNER", "ordering": "-attendee_count"},
+    ],
+)
+def test_event_filters_use_indexes(seeded_events, params):
+    params = {
+        name: str(seeded_events[0].id) if value == "OWNER" else value
+        for name, value in params.items()
+    }
+    request = Request(APIRequestFactory().get("/api/events/", params))
+    queryset = EventFilter(params, queryset=Event.objects.all()).qs
+    page = KeysetPagination().get_page_queryset(queryset, request)
+
+    plan = page.explain()
+    assert not FULL_SCAN.search(plan), plan
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite query plans")
+@pytest.mark.django_db
+def test_attendee_pages_use_index(user, event):
+    attendees = User.objects.bulk_create(User(username=f"attendee{i}") for i in range(200))
+    event.attendees.add(*attendees)
+    request = Request(APIRequestFactory().get("/api/events/1/attendees/"))
+    queryset = Event.attendees.through.objects.filter(event_id=event.pk)
+    page = AttendeePagination().get_page_queryset(queryset, request)
+
+    plan = page.explain()
+    assert "USING COVERING INDEX" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite query plans")
+@pytest.mark.django_db
+@pytest.mark.parametrize("relation", ["attendees", "owner"])
+@pytest.mark.parametrize("params", [{}, {"status": "past"}, {"status": "future"}])
+def test_user_events_use_indexes(seeded_events, relation, params):
+    user = seeded_events[0]
+    Event.attendees.through.objects.bulk_create(
+        Event.attendees.through(
+            event_id=event_id, user_id=seeded_events[(index + 1) % 50].id
+        )
+        for index, event_id in enumerate(Event.objects.values_list("pk", flat=True))
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    request = Request(APIRequestFactory().get("/api/events/", params))
+    queryset = Event.objects.filter(**{relation: user})
+    queryset = EventFilter(params, queryset=queryset).qs
+    page = KeysetPagination().get_page_queryset(queryset, request)
+
+    plan = page.explain()
+    assert not FULL_SCAN.search(plan), plan
+    if relation == "attendees":
+        assert "USING COVERING INDEX event_attendees_user_event_idx" in plan, plan
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite query plans")
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", [None, "start_date"])
+def test_search_uses_full_text_index(seeded_events, ordering):
+    params = {"q": "event12", **({"ordering": ordering} if ordering else {})}
+    request = Request(APIRequestFactory().get("/api/events/", params))
+    queryset = EventFilter(params, queryset=Event.objects.all()).qs
+    page = KeysetPagination().get_page_queryset(queryset, request)
+
+    plan = page.explain()
+    assert "SCAN events_event_fts VIRTUAL TABLE INDEX" in plan, plan
+    assert "SEARCH events_event USING INTEGER PRIMARY KEY" in plan, plan
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite query plans")
+@pytest.mark.django_db
+def test_broad_search_is_read_in_index_order(seeded_events, settings):
+    settings.SEARCH_RANK_LIMIT = 100
+    params = {"q": "description"}
+    request = Request(APIRequestFactory().get("/api/events/", params))
+    queryset = EventFilter(params, queryset=Event.objects.all()).qs
+    page = KeysetPagination().get_page_queryset(queryset, request)
+
+    plan = page.explain()
+    assert "SCAN events_event_fts VIRTUAL TABLE INDEX" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
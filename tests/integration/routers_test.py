@@ -0,0 +1,79 @@
+import random
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.http import JsonResponse
+from django.test import RequestFactory
+
+from events.models import Event
+from events.utils import handle_event_registration
+from tikoProject.middleware import ReadYourWritesMiddleware
+from tikoProject.routers import PrimaryReplicaRouter, request_scope
+
+User = get_user_model()
+pytest_plugins = ["tests.integration.utils.fixtures"]
+
+
+@pytest.fixture
+def stale_replica(settings, user, user2, user3, event_2):
+    """Copy the fixtures to the stale replica, which misses every later write."""
+    User.objects.using("stale_replica").bulk_create(
+        User.objects.filter(pk__in=[user.pk, user2.pk, user3.pk])
+    )
+    Event.objects.filter(pk=event_2.pk).update(capacity=10)
+    Event.objects.using("stale_replica").bulk_create(Event.objects.all())
+    settings.DATABASE_REPLICAS = {"stale_replica": 1}
+    return "stale_replica"
+
+
+@pytest.mark.django_db(databases=["default", "stale_replica"])
+def test_no_stale_read_after_write_in_request(
+    stale_replica, user, user3, event_2, fixed_datetime
+):
+    reads = []
+
+    def view(request):
+        event = Event.objects.get(pk=event_2.pk)
+        reads.append(event.attendee_count)
+        handle_event_registration(event, request.user, register=True)
+        reads.append(Event.objects.get(pk=event_2.pk).attendee_count)
+        return JsonResponse({})
+
+    middleware = ReadYourWritesMiddleware(view)
+    for attendee in (user, user3):
+        request = RequestFactory().get("/")
+        request.user = attendee
+        middleware(request)
+
+    # The second request reads from the replica again until it writes itself.
+    assert reads == [0, 1, 0, 2]
+
+
+@pytest.mark.django_db(databases=["default", "stale_replica"])
+def test_reads_go_to_replicas_and_writes_to_primary(stale_replica, event_2):
+    router = PrimaryReplicaRouter()
+
+    with request_scope():
+        assert router.db_for_read(Event) == stale_replica
+        assert router.db_for_read(User) == stale_replica
+        assert router.db_for_write(Event) == DEFAULT_DB_ALIAS
+        assert router.db_for_read(Event) == DEFAULT_DB_ALIAS
+
+
+def test_replicas_are_weighted(settings):
+    settings.DATABASE_REPLICAS = {"replica1": 3, "replica2": 1}
+    random.seed(0)
+    router = PrimaryReplicaRouter()
+
+    with request_scope():
+        picks = [router.db_for_read(Event) for _ in range(4000)]
+
+    assert 2800 < picks.count("replica1") < 3200
+    assert picks.count("replica1") + picks.count("replica2") == len(picks)
+
+
+def test_without_replicas_reads_go_to_primary(settings):
+    settings.DATABASE_REPLICAS = {}
+
+    assert PrimaryReplicaRouter().db_for_read(Event) == DEFAULT_DB_ALIAS
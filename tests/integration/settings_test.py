@@ -0,0 +1,54 @@
+import importlib
+import sys
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+
+def load_production_settings():
+    sys.modules.pop("tikoProject.settings_production", None)
+    return importlib.import_module("tikoProject.settings_production")
+
+
+def test_production_settings_share_the_cache(monkeypatch):
+    monkeypatch.delenv("CACHE_BACKEND", raising=False)
+    monkeypatch.delenv("TOKEN_REVOCATION_CACHE_ALIAS", raising=False)
+    production = load_production_settings()
+    assert production.CACHES["default"]["BACKEND"] == (
+        "django.core.cache.backends.filebased.FileBasedCache"
+    )
+
+    monkeypatch.setenv(
+        "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+    )
+    with pytest.raises(ImproperlyConfigured):
+        load_production_settings()
+
+    monkeypatch.setattr("tikoProject.settings.EVENTS_LIST_CACHE_TIMEOUT", "0")
+    production = load_production_settings()
+    assert production.CACHES["default"]["BACKEND"].endswith("LocMemCache")
+
+
+def test_production_settings_share_revoked_tokens(monkeypatch):
+    monkeypatch.delenv("CACHE_BACKEND", raising=False)
+    monkeypatch.delenv("TOKEN_REVOCATION_CACHE_ALIAS", raising=False)
+    production = load_production_settings()
+    assert production.TOKEN_REVOCATION_CACHE_ALIAS == "tokens"
+    assert production.CACHES["tokens"]["BACKEND"].endswith("DatabaseCache")
+
+    monkeypatch.setenv("TOKEN_REVOCATION_CACHE_ALIAS", "missing")
+    with pytest.raises(ImproperlyConfigured):
+        load_production_settings()
+
+    # The file-based cache is shared, but its `add` is not atomic.
+    monkeypatch.setenv("TOKEN_REVOCATION_CACHE_ALIAS", "default")
+    with pytest.raises(ImproperlyConfigured):
+        load_production_settings()
+
+    monkeypatch.setenv("TOKEN_REVOCATION_CACHE_ALIAS", "default")
+    monkeypatch.setenv(
+        "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+    )
+    monkeypatch.setattr("tikoProject.settings.EVENTS_LIST_CACHE_TIMEOUT", "0")
+    with pytest.raises(ImproperlyConfigured):
+        load_production_settings()
@@ -1,13 +1,21 @@
 import datetime
+import os
+import time
+from io import StringIO
 
+import jwt
 import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
 
 from tests.integration.utils.auth_utils import get_auth_headers
 
+from tokens_auth.cache import VerifiedTokenCache, token_cache
+from tokens_auth.keys import get_keyring
+from tokens_auth.revocation import RevocationStore, revocation_store
 from tokens_auth.services import TokenService, TokenType
 
 pytest_plugins = ["tests.integration.utils.fixtures"]
@@ -69,3 +77,203 @@ def test_refresh_token(api_client):
 
     response = api_client.post(reverse("refresh"), data=data)
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_refresh_token_rotation(api_client, user):
+    refresh_token = TokenService().generate_token_pair(user.id)["refresh_token"]
+
+    response = api_client.post(reverse("refresh"), {"refresh_token": refresh_token})
+    assert response.status_code == status.HTTP_200_OK
+    rotated_token = response.json()["refresh_token"]
+    assert rotated_token != refresh_token
+
+    # A refresh token can only be used once.
+    response = api_client.post(reverse("refresh"), {"refresh_token": refresh_token})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.post(reverse("refresh"), {"refresh_token": rotated_token})
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_revoke_refresh_token(api_client, user):
+    refresh_token = TokenService().generate_token_pair(user.id)["refresh_token"]
+
+    response = api_client.post(reverse("revoke"), {"refresh_token": refresh_token})
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    response = api_client.post(reverse("revoke"), {"refresh_token": refresh_token})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.post(reverse("refresh"), {"refresh_token": refresh_token})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert len(revocation_store) == 1
+
+
+def test_revocation_store_sweeps_expired_entries():
+    store = RevocationStore()
+    now = time.time()
+    store.revoke("expired", now - 1)
+    store.revoke("valid", now + 60)
+
+    assert not store.is_revoked("expired")
+    assert store.is_revoked("valid")
+    assert len(store) == 1
+
+
+def test_revocation_store_shared_through_cache():
+    worker_a, worker_b = RevocationStore("default"), RevocationStore("default")
+    expires_at = time.time() + 60
+
+    assert worker_a.revoke("jti", expires_at)
+    assert worker_b.is_revoked("jti")
+    assert not worker_b.revoke("jti", expires_at)
+
+
+@pytest.mark.django_db
+def test_revocation_store_shared_through_database_cache(settings):
+    # The cache the production settings use, its `add` is a unique insert.
+    settings.CACHES = {
+        **settings.CACHES,
+        "tokens": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "token_revocations",
+        },
+    }
+    call_command("createcachetable", "token_revocations")
+    worker_a, worker_b = RevocationStore("tokens"), RevocationStore("tokens")
+    expires_at = time.time() + 60
+
+    assert worker_a.revoke("jti", expires_at)
+    assert worker_b.is_revoked("jti")
+    assert not worker_b.revoke("jti", expires_at)
+
+
+@pytest.mark.django_db
+def test_access_token_cache_skips_user_lookup(
+    api_client, user, django_assert_num_queries, settings
+):
+    settings.EVENTS_LIST_CACHE_TIMEOUT = 0
+    headers = get_auth_headers(user)
+    api_client.get(reverse("event-list"), headers=headers)
+    with django_assert_num_queries(2):
+        response = api_client.get(reverse("event-list"), headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert token_cache.stats()["hits"] == 1
+    assert token_cache.stats()["misses"] == 1
+
+
+@pytest.mark.django_db
+def test_access_token_cache_entry_expires_with_token(user):
+    token_cache.set("token", user, time.time() - 1)
+    assert token_cache.get("token") is None
+
+
+def test_access_token_cache_evicts_least_recently_used():
+    cache = VerifiedTokenCache(maxsize=2)
+    expires_at = time.time() + 60
+    cache.set("a", "user_a", expires_at)
+    cache.set("b", "user_b", expires_at)
+    cache.get("a")
+    cache.set("c", "user_c", expires_at)
+    assert cache.get("b") is None
+    assert cache.get("a") == "user_a"
+    assert cache.stats()["size"] == 2
+
+
+@pytest.fixture(params=["EdDSA", "ES256"])
+def asymmetric_keys(request, settings, tmp_path):
+    settings.JWT_ALGORITHM = request.param
+    settings.JWT_KEYS_DIR = tmp_path
+    call_command("generate_jwt_key", kid="2024-01", stdout=StringIO())
+    return tmp_path
+
+
+def publish_keys(directory, age: int) -> None:
+    """Date the key files back, as if they had been published `age` seconds ago."""
+    published_at = time.time() - age
+    for path in directory.glob("*.pem"):
+        os.utime(path, (published_at, published_at))
+
+
+@pytest.mark.django_db
+def test_asymmetric_tokens_verified_with_jwks(api_client, user, asymmetric_keys):
+    tokens = TokenService().generate_token_pair(user.id)
+    access_token = tokens["access_token"]
+    assert jwt.get_unverified_header(access_token)["kid"] == "2024-01"
+
+    response = api_client.get(reverse("jwks"))
+    assert response.status_code == status.HTTP_200_OK
+    assert "max-age=3600" in response["Cache-Control"]
+    assert "d" not in response.json()["keys"][0]
+
+    # Another service verifies the token with the published keys only.
+    jwk_set = jwt.PyJWKSet.from_dict(response.json())
+    payload = jwt.decode(
+        access_token,
+        jwk_set["2024-01"].key,
+        algorithms=[settings.JWT_ALGORITHM],
+    )
+    assert payload["user_id"] == user.id
+
+    response = api_client.get(reverse("event-list"), headers=get_auth_headers(user))
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_jwks_conditional_get(api_client, asymmetric_keys):
+    response = api_client.get(reverse("jwks"))
+    response = api_client.get(
+        reverse("jwks"), headers={"If-None-Match": response["ETag"]}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_signing_key_rotation(api_client, user, asymmetric_keys, settings):
+    service = TokenService()
+    publish_keys(asymmetric_keys, age=3600)
+    old_token = service.generate_token_pair(user.id)["refresh_token"]
+
+    # The new key is published at once, without reloading the settings, but keeps
+    # signing with the old key until clients have refreshed their cached JWK Set.
+    call_command("generate_jwt_key", kid="2024-02", stdout=StringIO())
+    kids = [key["kid"] for key in api_client.get(reverse("jwks")).json()["keys"]]
+    assert kids == ["2024-01", "2024-02"]
+    token = service.generate_token_pair(user.id)["refresh_token"]
+    assert jwt.get_unverified_header(token)["kid"] == "2024-01"
+    assert get_keyring().refresh_at == pytest.approx(
+        (asymmetric_keys / "2024-02.pem").stat().st_mtime + 3600
+    )
+
+    publish_keys(asymmetric_keys, age=3600)
+    settings.JWT_KEYS_DIR = asymmetric_keys
+    new_token = service.generate_token_pair(user.id)["refresh_token"]
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "2024-02"
+    assert service.validate_refresh_token(old_token)["user_id"] == user.id
+    assert service.validate_refresh_token(new_token)["user_id"] == user.id
+
+    # Once retired, the old key no longer verifies anything.
+    (asymmetric_keys / "2024-01.pem").unlink()
+    assert service.validate_refresh_token(old_token) is None
+    assert service.validate_refresh_token(new_token)["user_id"] == user.id
+
+
+@pytest.mark.django_db
+def test_active_key_id_signs_at_once(user, asymmetric_keys, settings):
+    call_command("generate_jwt_key", kid="2024-02", stdout=StringIO())
+    settings.JWT_ACTIVE_KEY_ID = "2024-02"
+    token = TokenService().generate_token_pair(user.id)["access_token"]
+    assert jwt.get_unverified_header(token)["kid"] == "2024-02"
+
+
+@pytest.mark.django_db
+def test_token_with_foreign_algorithm_is_rejected(user, asymmetric_keys):
+    hmac_token = jwt.encode(
+        {"user_id": user.id, "type": "access"}, "guessed", algorithm="HS256"
+    )
+    assert TokenService().validate_access_token(hmac_token) is None
+
+
+def test_jwks_empty_for_shared_secret(api_client):
+    response = api_client.get(reverse("jwks"))
+    assert response.json() == {"keys": []}
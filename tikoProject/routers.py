@@ -0,0 +1,61 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_pinned_to_primary: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+
+
+def pin_to_primary() -> None:
+    """Send all following reads of the current request to the primary database."""
+    _pinned_to_primary.set(True)
+
+
+def is_pinned_to_primary() -> bool:
+    return _pinned_to_primary.get()
+
+
+@contextmanager
+def request_scope():
+    """Scope the primary pinning to one request.
+
+    Threaded and async servers reuse contexts across requests, so a pin set by a
+    write must not leak into the next request served by the same worker.
+    """
+    token = _pinned_to_primary.set(False)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Database router sending reads to the replicas and writes to the primary.
+    Replicas are picked at random, weighted by `settings.DATABASE_REPLICAS`. Once the
+    current request wrote to the primary, its following reads stay on the primary,
+    so it never reads data older than its own writes from a lagging replica.
+    """
+
+    route_app_labels = {"events", "tokens_auth", "auth"}
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in self.route_app_labels:
+            return None
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or is_pinned_to_primary():
+            return DEFAULT_DB_ALIAS
+        aliases = list(replicas)
+        weights = [replicas[alias] for alias in aliases]
+        return random.choices(aliases, weights=weights)[0]
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold copies of the primary data, so objects read from any of
+        # them can be related to each other.
+        return True
@@ -28,7 +28,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.getenv("SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# Production deployments use tikoProject.settings_production, which turns it off.
+DEBUG = os.getenv("DEBUG", "True") == "True"
 
 ALLOWED_HOSTS = ["0.0.0.0", "127.0.0.1"]
 
@@ -46,10 +47,14 @@ INSTALLED_APPS = [
     "drf_spectacular",
     "events",
     "tokens_auth",
+    "monitoring",
 ]
 
 MIDDLEWARE = [
+    "monitoring.middleware.RequestMetricsMiddleware",
+    "monitoring.middleware.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "tikoProject.middleware.ReadYourWritesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -82,10 +87,63 @@ WSGI_APPLICATION = "tikoProject.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Pragmas applied to every new SQLite connection. WAL lets readers run alongside
+# the single writer, and synchronous=NORMAL is durable enough in WAL mode.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "wal"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "normal"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", 134217728),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", -20000),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "memory"),
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()
+            ),
+            # Seconds a connection waits for the write lock before failing.
+            "timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 20)),
+            # Transactions take the write lock up front, so a reader never has to
+            # upgrade its lock, which SQLite fails without waiting for the timeout.
+            "transaction_mode": "IMMEDIATE",
+        },
+        "CONN_MAX_AGE": int(os.getenv("CONN_MAX_AGE", 600)),
+        "CONN_HEALTH_CHECKS": True,
+    }
+}
+
+# Read replicas of the primary as comma separated "<file>:<weight>" pairs, e.g.
+# "replica1.sqlite3:2,replica2.sqlite3:1". Keeping the replicas up to date is left to
+# the replication setup. Reads are spread over the replicas by weight, see
+# tikoProject.routers.PrimaryReplicaRouter.
+DATABASE_REPLICAS = {}
+for index, replica in enumerate(os.getenv("DATABASE_REPLICAS", "").split(","), 1):
+    if not replica:
+        continue
+    name, _, weight = replica.partition(":")
+    DATABASES[f"replica{index}"] = {
+        **DATABASES["default"],
+        "NAME": BASE_DIR / name,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS[f"replica{index}"] = int(weight or 1)
+
+DATABASE_ROUTERS = ["tikoProject.routers.PrimaryReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
     }
 }
 
@@ -138,6 +196,45 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+EVENTS_PAGE_SIZE = os.getenv("EVENTS_PAGE_SIZE", 50)
+# Number of events fetched per query by the streaming exports.
+EXPORT_CHUNK_SIZE = os.getenv("EXPORT_CHUNK_SIZE", 1000)
+EVENTS_BULK_BATCH_SIZE = os.getenv("EVENTS_BULK_BATCH_SIZE", 1000)
+EVENTS_LIST_CACHE_ALIAS = os.getenv("EVENTS_LIST_CACHE_ALIAS", "default")
+EVENTS_LIST_CACHE_TIMEOUT = os.getenv("EVENTS_LIST_CACHE_TIMEOUT", 300)
+# Searches matching more events are listed newest first instead of by relevance.
+SEARCH_RANK_LIMIT = os.getenv("SEARCH_RANK_LIMIT", 10000)
+
+# Fail requests whose view runs more queries than its `query_budget` instead of
+# logging a warning. Enabled in the test suite.
+QUERY_BUDGET_ENFORCE = os.getenv("QUERY_BUDGET_ENFORCE", "False") == "True"
+
+# Requests sending PROFILING_TOKEN in the X-Profile header are profiled, as well as
+# a PROFILING_SAMPLE_RATE share of all requests. Unset or 0 turns profiling off.
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+PROFILING_SAMPLE_RATE = os.getenv("PROFILING_SAMPLE_RATE", 0)
+PROFILING_INTERVAL = os.getenv("PROFILING_INTERVAL", 0.001)
+PROFILING_DIR = os.getenv("PROFILING_DIR", BASE_DIR / "profiles")
+PROFILING_MAX_FILES = os.getenv("PROFILING_MAX_FILES", 100)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "monitoring.logging.JsonFormatter"},
+    },
+    "handlers": {
+        "json": {"class": "logging.StreamHandler", "formatter": "json"},
+    },
+    "loggers": {
+        "monitoring": {
+            "handlers": ["json"],
+            "level": os.getenv("REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Tiko Test Project",
     "VERSION": "1.0.0",
@@ -146,5 +243,16 @@ SPECTACULAR_SETTINGS = {
 
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
+# Private keys of the asymmetric algorithms (EdDSA, ES256) as <kid>.pem files. New
+# tokens are signed with JWT_ACTIVE_KEY_ID, if unset with the greatest key ID whose
+# file is older than JWKS_MAX_AGE, all other keys stay valid for verification until
+# they are removed.
+JWT_KEYS_DIR = os.getenv("JWT_KEYS_DIR", BASE_DIR / "keys")
+JWT_ACTIVE_KEY_ID = os.getenv("JWT_ACTIVE_KEY_ID")
+JWKS_MAX_AGE = os.getenv("JWKS_MAX_AGE", 3600)
 ACCESS_TOKEN_LIFETIME = os.getenv("ACCESS_TOKEN_LIFETIME")
 REFRESH_TOKEN_LIFETIME = os.getenv("REFRESH_TOKEN_LIFETIME")
+ACCESS_TOKEN_CACHE_SIZE = os.getenv("ACCESS_TOKEN_CACHE_SIZE", 1024)
+# Cache shared by all workers that holds revoked refresh token IDs. If unset, each
+# worker process only knows the revocations it made itself.
+TOKEN_REVOCATION_CACHE_ALIAS = os.getenv("TOKEN_REVOCATION_CACHE_ALIAS", "")
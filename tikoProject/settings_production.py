@@ -0,0 +1,78 @@
+"""
+Production settings for tikoProject project.
+
+Extends the base settings with DEBUG turned off, so that executed queries are not
+kept in memory, with the allowed hosts taken from the environment, and with a cache
+shared by all worker processes.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from tikoProject.settings import *  # noqa: F401,F403
+from tikoProject.settings import (BASE_DIR, CACHES, EVENTS_LIST_CACHE_ALIAS,
+                                  EVENTS_LIST_CACHE_TIMEOUT)
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "0.0.0.0,127.0.0.1").split(",")
+
+# Cached event lists, their ETags and generation counters must be the same in every
+# gunicorn worker, so the default cache is shared through files, which serves the
+# workers of one host. Deployments over several hosts set CACHE_BACKEND to Redis or
+# Memcached.
+CACHES = {
+    **CACHES,
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", str(BASE_DIR / "cache")),
+    },
+    # Created by `createcachetable`, see `run.sh`.
+    "tokens": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "token_revocations",
+    },
+}
+
+# Revoked refresh tokens must be rejected by every worker, not only the one that
+# revoked them, so they are kept in a shared cache. Only one of two concurrent
+# rotations of a token may succeed, which takes an atomic `add`. The database cache
+# inserts under a unique key and is used if unset.
+TOKEN_REVOCATION_CACHE_ALIAS = os.getenv("TOKEN_REVOCATION_CACHE_ALIAS") or "tokens"
+
+# Backends whose entries only exist in the memory of one process.
+PER_PROCESS_CACHE_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
+
+# Backends whose `add` is a lookup followed by a separate write.
+NON_ATOMIC_ADD_CACHE_BACKENDS = ("django.core.cache.backends.filebased.FileBasedCache",)
+
+if (
+    CACHES[EVENTS_LIST_CACHE_ALIAS]["BACKEND"] in PER_PROCESS_CACHE_BACKENDS
+    and int(EVENTS_LIST_CACHE_TIMEOUT) > 0
+):
+    raise ImproperlyConfigured(
+        f"The events list cache {EVENTS_LIST_CACHE_ALIAS!r} is per process, the "
+        "other workers would serve stale lists. Set CACHE_BACKEND to a shared "
+        "backend or EVENTS_LIST_CACHE_TIMEOUT=0."
+    )
+
+revocation_backend = CACHES.get(TOKEN_REVOCATION_CACHE_ALIAS, {}).get("BACKEND")
+if revocation_backend in (
+    None,
+    "django.core.cache.backends.dummy.DummyCache",
+    *PER_PROCESS_CACHE_BACKENDS,
+):
+    raise ImproperlyConfigured(
+        f"TOKEN_REVOCATION_CACHE_ALIAS {TOKEN_REVOCATION_CACHE_ALIAS!r} is not a cache "
+        "shared by all workers, revoked refresh tokens would stay valid in the other "
+        "workers."
+    )
+if revocation_backend in NON_ATOMIC_ADD_CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"TOKEN_REVOCATION_CACHE_ALIAS {TOKEN_REVOCATION_CACHE_ALIAS!r} has no atomic "
+        "add, concurrent rotations of one refresh token could all succeed. Use the "
+        "database cache, Redis or Memcached."
+    )
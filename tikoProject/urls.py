@@ -20,10 +20,16 @@ from django.urls import include, path
 from drf_spectacular.views import (SpectacularAPIView, SpectacularRedocView,
                                    SpectacularSwaggerView)
 
+from monitoring.views import metrics
+from tokens_auth.views import jwks
+
 urlpatterns = [
     path("api/events/", include("events.urls")),
+    path("api/async/events/", include("events.async_urls")),
     path("api/auth/", include("tokens_auth.urls")),
     path("admin/", admin.site.urls),
+    path("metrics", metrics, name="metrics"),
+    path(".well-known/jwks.json", jwks, name="jwks"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/schema/swagger-ui/",
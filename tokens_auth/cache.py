@@ -0,0 +1,80 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+
+
+class VerifiedTokenCache:
+    """Bounded LRU cache of already verified access tokens and their users.
+
+    Every entry expires at the token's own ``exp`` claim, so a cached token is never
+    accepted for longer than ``jwt.decode`` would have accepted it.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[User, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[User]:
+        """Return the cached user for a token if it is still valid.
+
+        Args:
+            token (str): Encoded JWT access token string.
+
+        Returns:
+            Optional[User]: The user the token was issued for, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def set(self, token: str, user: User, expires_at: float) -> None:
+        """Store a verified token, evicting the least recently used entries if full.
+
+        Args:
+            token (str): Encoded JWT access token string.
+            user (User): The user resolved from the token payload.
+            expires_at (float): Unix timestamp of the token's ``exp`` claim.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (user, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return the current size and hit/miss counters of the cache."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = VerifiedTokenCache(maxsize=int(settings.ACCESS_TOKEN_CACHE_SIZE))
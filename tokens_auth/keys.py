@@ -0,0 +1,207 @@
+import functools
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+# Asymmetric algorithms and how to generate and publish their keys.
+ASYMMETRIC_ALGORITHMS = {
+    "EdDSA": (lambda: ed25519.Ed25519PrivateKey.generate(), OKPAlgorithm),
+    "ES256": (lambda: ec.generate_private_key(ec.SECP256R1()), ECAlgorithm),
+}
+
+
+class KeyRing:
+    """Keys used to sign and verify JWTs, identified by their key ID (`kid`).
+
+    With an asymmetric algorithm tokens are signed with the private key of the active
+    key ID, and verified with the public key named by the `kid` header of the token.
+    Retired keys stay in the ring for verification until the tokens they signed have
+    expired, which makes key rotation seamless. The public keys are published as a
+    JWK Set, so other services can verify tokens without holding any secret.
+
+    A new key is published in the JWK Set at once but only signs tokens once it has
+    been published for `max_age` seconds, the time clients may cache the set, unless
+    it is named as the active key explicitly.
+
+    With an HMAC algorithm the ring holds the shared `JWT_SECRET_KEY` only.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        private_keys: Optional[dict] = None,
+        active_kid: Optional[str] = None,
+        secret: Optional[str] = None,
+        published_at: Optional[dict] = None,
+        max_age: float = 0,
+    ):
+        self.algorithm = algorithm
+        self.private_keys = private_keys or {}
+        self.public_keys = {
+            kid: key.public_key() for kid, key in self.private_keys.items()
+        }
+        self.secret = secret
+        # Time at which a pending key becomes active and the ring has to be reloaded.
+        self.refresh_at = None
+        if self.is_asymmetric:
+            if not self.private_keys:
+                raise ImproperlyConfigured(
+                    f"JWT_ALGORITHM {algorithm} needs at least one key in JWT_KEYS_DIR."
+                )
+            if active_kid:
+                self.active_kid = active_kid
+            else:
+                self.active_kid, self.refresh_at = self.select_active_kid(
+                    published_at or {}, max_age
+                )
+            if self.active_kid not in self.private_keys:
+                raise ImproperlyConfigured(
+                    f"JWT_ACTIVE_KEY_ID {self.active_kid} is not in JWT_KEYS_DIR."
+                )
+        else:
+            self.active_kid = None
+
+    def select_active_kid(
+        self, published_at: dict, max_age: float
+    ) -> tuple[str, Optional[float]]:
+        """Pick the greatest key ID that every client caching the JWK Set knows.
+
+        Args:
+            published_at (dict): Unix time each key was published, keys missing
+                from it count as published long ago.
+            max_age (float): Seconds clients may cache the JWK Set.
+
+        Returns:
+            tuple[str, Optional[float]]: The active key ID, and the time the next
+                greater key becomes active, None if there is no such key.
+        """
+        now = time.time()
+        active_at = {
+            kid: published_at.get(kid, 0) + max_age for kid in self.private_keys
+        }
+        # Before any key is old enough, e.g. on a first deployment, the oldest signs.
+        active_kid = max(
+            (kid for kid, at in active_at.items() if at <= now),
+            default=min(self.private_keys),
+        )
+        pending = [at for kid, at in active_at.items() if kid > active_kid]
+        return active_kid, min(pending, default=None)
+
+    @classmethod
+    def from_settings(cls) -> "KeyRing":
+        """Load the keys configured by `JWT_ALGORITHM` and `JWT_KEYS_DIR`.
+
+        Private keys are read from the `<kid>.pem` files of the keys directory, the
+        modification time of a file is the time its key was published.
+        """
+        algorithm = settings.JWT_ALGORITHM
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            return cls(algorithm, secret=settings.JWT_SECRET_KEY)
+        private_keys, published_at = {}, {}
+        for path in sorted(Path(settings.JWT_KEYS_DIR).glob("*.pem")):
+            private_keys[path.stem] = serialization.load_pem_private_key(
+                path.read_bytes(), password=None
+            )
+            published_at[path.stem] = path.stat().st_mtime
+        return cls(
+            algorithm,
+            private_keys,
+            settings.JWT_ACTIVE_KEY_ID,
+            published_at=published_at,
+            max_age=int(settings.JWKS_MAX_AGE),
+        )
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.algorithm in ASYMMETRIC_ALGORITHMS
+
+    def signing_key(self) -> tuple[Optional[str], object]:
+        """Return the key ID and the key new tokens are signed with."""
+        if not self.is_asymmetric:
+            return None, self.secret
+        return self.active_kid, self.private_keys[self.active_kid]
+
+    def verification_key(self, kid: Optional[str]) -> Optional[object]:
+        """Return the key verifying tokens signed under `kid`, None if unknown."""
+        if not self.is_asymmetric:
+            return self.secret
+        if not isinstance(kid, str):
+            return None
+        return self.public_keys.get(kid)
+
+    @functools.cached_property
+    def jwks_etag(self) -> str:
+        return hashlib.sha256(self.jwks).hexdigest()[:32]
+
+    @functools.cached_property
+    def jwks(self) -> bytes:
+        """The public keys as serialized JWK Set, empty for HMAC algorithms."""
+        keys = []
+        if self.is_asymmetric:
+            jwk_algorithm = ASYMMETRIC_ALGORITHMS[self.algorithm][1]
+            for kid, key in sorted(self.public_keys.items()):
+                jwk = jwk_algorithm.to_jwk(key, as_dict=True)
+                keys.append({**jwk, "kid": kid, "alg": self.algorithm, "use": "sig"})
+        return json.dumps({"keys": keys}, separators=(",", ":")).encode()
+
+
+def generate_private_key(algorithm: str) -> bytes:
+    """Generate a private key for an asymmetric algorithm as unencrypted PEM.
+
+    Args:
+        algorithm (str): One of the `ASYMMETRIC_ALGORITHMS`.
+
+    Returns:
+        bytes: The private key in PKCS#8 PEM encoding.
+    """
+    generate, _ = ASYMMETRIC_ALGORITHMS[algorithm]
+    return generate().private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+def get_keyring() -> KeyRing:
+    """Return the key ring, reloaded whenever the keys directory has changed.
+
+    Adding or removing a key file changes the modification time of the directory,
+    so every worker picks up a new key on its next token, and activates it at the
+    same time as all other workers.
+    """
+    keyring = load_keyring(keys_version())
+    if keyring.refresh_at is not None and keyring.refresh_at <= time.time():
+        load_keyring.cache_clear()
+        keyring = load_keyring(keys_version())
+    return keyring
+
+
+def keys_version() -> Optional[int]:
+    if settings.JWT_ALGORITHM not in ASYMMETRIC_ALGORITHMS:
+        return None
+    try:
+        return os.stat(settings.JWT_KEYS_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def load_keyring(version: Optional[int]) -> KeyRing:
+    return KeyRing.from_settings()
+
+
+@receiver(setting_changed)
+def reset_keyring(setting, **kwargs):
+    if setting.startswith(("JWT_", "JWKS_")):
+        load_keyring.cache_clear()
@@ -0,0 +1,49 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tokens_auth.keys import ASYMMETRIC_ALGORITHMS, generate_private_key
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a new token signing key in JWT_KEYS_DIR. It is published in the "
+        "JWK Set at once and, unless JWT_ACTIVE_KEY_ID is set, starts signing new "
+        "tokens JWKS_MAX_AGE seconds later if it has the greatest key ID."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--algorithm",
+            choices=sorted(ASYMMETRIC_ALGORITHMS),
+            default=(
+                settings.JWT_ALGORITHM
+                if settings.JWT_ALGORITHM in ASYMMETRIC_ALGORITHMS
+                else "EdDSA"
+            ),
+        )
+        parser.add_argument(
+            "--kid", help="Key ID, defaults to the current UTC timestamp."
+        )
+
+    def handle(self, *args, **options):
+        kid = options["kid"] or timezone.now().strftime("%Y%m%d%H%M%S")
+        directory = Path(settings.JWT_KEYS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{kid}.pem"
+        if path.exists():
+            raise CommandError(f"Key {kid} already exists.")
+
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as file:
+            file.write(generate_private_key(options["algorithm"]))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {options['algorithm']} key {kid} in {path}. It signs new "
+                f"tokens in {int(settings.JWKS_MAX_AGE)}s, once clients have "
+                "refreshed their cached JWK Set."
+            )
+        )
@@ -1,26 +1,80 @@
+from typing import Optional
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import User
 from rest_framework import permissions
 from rest_framework.exceptions import AuthenticationFailed
 
-from tokens_auth.services import TokenService
+from monitoring.metrics import TOKEN_VALIDATIONS
+from tokens_auth.cache import token_cache
+from tokens_auth.services import TokenService, TokenType
 
 
 class HasValidAccessToken(permissions.BasePermission):
     """
     Custom permission to check for a valid access token.
+    Verified tokens are cached until their expiry, so repeated calls with the same
+    token skip both the signature check and the user lookup.
     """
 
     def has_permission(self, request, view):
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.lower().startswith("bearer "):
-            token = auth_header.split(" ")[1]
+        token, user, payload = self.check_token(request)
+        if user is None:
+            user = get_user_model().objects.filter(pk=payload.get("user_id")).first()
+        return self.grant(request, token, user, payload)
+
+    async def ahas_permission(self, request, view=None):
+        """Async variant of `has_permission` for native async views."""
+        token, user, payload = self.check_token(request)
+        if user is None:
+            user = await (
+                get_user_model().objects.filter(pk=payload.get("user_id")).afirst()
+            )
+        return self.grant(request, token, user, payload)
+
+    def check_token(self, request) -> tuple[str, Optional[User], Optional[dict]]:
+        """Validate the access token of a request, without any query.
+
+        Args:
+            request (HttpRequest): The request to authenticate.
+
+        Returns:
+            tuple[str, Optional[User], Optional[dict]]: The token, with its user if
+                the token is cached, otherwise with its decoded payload.
+
+        Raises:
+            AuthenticationFailed: If the token is missing or invalid.
+        """
+        token = self.get_token(request)
+        if token:
+            if user := token_cache.get(token):
+                TOKEN_VALIDATIONS.labels(TokenType.ACCESS.value, "cached").inc()
+                return token, user, None
             payload = TokenService().validate_access_token(token)
-            User = get_user_model()
             if payload:
-                try:
-                    request.user = User.objects.get(pk=payload.get("user_id"))
-                    return True
-                except User.DoesNotExist:
-                    raise AuthenticationFailed("Invalid token user.")
+                return token, None, payload
 
         raise AuthenticationFailed("Invalid or missing access token.")
+
+    @staticmethod
+    def grant(
+        request, token: str, user: Optional[User], payload: Optional[dict]
+    ) -> bool:
+        """Authenticate the request as the token's user, caching a new token.
+
+        Raises:
+            AuthenticationFailed: If the user of the token does not exist.
+        """
+        if user is None:
+            raise AuthenticationFailed("Invalid token user.")
+        if payload is not None:
+            token_cache.set(token, user, payload["exp"])
+        request.user = user
+        return True
+
+    @staticmethod
+    def get_token(request) -> Optional[str]:
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.lower().startswith("bearer "):
+            return auth_header.split(" ")[1]
+        return None
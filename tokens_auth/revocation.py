@@ -0,0 +1,94 @@
+import heapq
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class RevocationStore:
+    """Set of revoked token IDs (`jti`), each kept until its token expires.
+
+    Lookups are a dict access without SQL. Entries are swept in expiry order from a
+    heap, so the store never holds more than the tokens revoked within one refresh
+    token lifetime. If a cache alias is given, revocations are also written to that
+    cache, which lets every worker process see them, and the local dict serves as a
+    front for it.
+    """
+
+    prefix = "tokens:revoked"
+
+    def __init__(self, cache_alias: Optional[str] = None):
+        self.cache_alias = cache_alias
+        self._revoked: dict[str, float] = {}
+        self._expiry: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias] if self.cache_alias else None
+
+    def revoke(self, jti: str, expires_at: float) -> bool:
+        """Revoke a token ID until the token expires.
+
+        Args:
+            jti (str): ID of the token.
+            expires_at (float): Unix timestamp of the token's ``exp`` claim.
+
+        Returns:
+            bool: True if the token was revoked by this call, False if it already was,
+                so of two concurrent rotations of the same token only one succeeds,
+                across workers if the cache's `add` is atomic.
+        """
+        now = time.time()
+        with self._lock:
+            self._sweep(now)
+            if jti in self._revoked:
+                return False
+            if self.cache is not None:
+                timeout = max(int(expires_at - now) + 1, 1)
+                if not self.cache.add(f"{self.prefix}:{jti}", True, timeout=timeout):
+                    self._remember(jti, expires_at)
+                    return False
+            self._remember(jti, expires_at)
+            return True
+
+    def is_revoked(self, jti: str) -> bool:
+        """Check whether a token ID has been revoked.
+
+        Args:
+            jti (str): ID of the token.
+
+        Returns:
+            bool: True if the token ID is revoked.
+        """
+        with self._lock:
+            self._sweep(time.time())
+            if jti in self._revoked:
+                return True
+        cache = self.cache
+        return cache is not None and cache.get(f"{self.prefix}:{jti}", False)
+
+    def _remember(self, jti: str, expires_at: float) -> None:
+        self._revoked[jti] = expires_at
+        heapq.heappush(self._expiry, (expires_at, jti))
+
+    def _sweep(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            _, jti = heapq.heappop(self._expiry)
+            self._revoked.pop(jti, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+            self._expiry.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._revoked)
+
+
+revocation_store = RevocationStore(
+    cache_alias=settings.TOKEN_REVOCATION_CACHE_ALIAS or None
+)
@@ -1,10 +1,15 @@
 import datetime
+import uuid
 from enum import Enum
 from typing import Optional
 
 import jwt
 from django.conf import settings
 
+from monitoring.metrics import TOKEN_VALIDATIONS
+from tokens_auth.keys import get_keyring
+from tokens_auth.revocation import revocation_store
+
 
 class TokenType(Enum):
     ACCESS = "access"
@@ -18,6 +23,10 @@ class TokenService:
     ) -> str:
         """Create a JWT token with specified user ID, type, and lifetime.
 
+        Every token gets a unique ID (`jti`) by which it can be revoked. Tokens are
+        signed with the active key of the key ring, whose ID is set as the `kid`
+        header for asymmetric algorithms.
+
         Args:
             user_id (int): The ID of the user for whom the token is generated.
             token_type (TokenType): Type of the token (access or refresh).
@@ -31,15 +40,23 @@ class TokenService:
             "exp": datetime.datetime.now(datetime.UTC) + lifetime,
             "iat": datetime.datetime.now(datetime.UTC),
             "type": token_type.value,
+            "jti": uuid.uuid4().hex,
         }
+        kid, key = get_keyring().signing_key()
         return jwt.encode(
-            payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+            payload,
+            key,
+            algorithm=settings.JWT_ALGORITHM,
+            headers={"kid": kid} if kid else None,
         )
 
     @staticmethod
     def decode_token(token: str, token_type: TokenType) -> Optional[dict]:
         """Decode and validate a JWT token.
 
+        The token is verified with the key named by its `kid` header, and only with
+        the configured algorithm.
+
         Args:
             token (str): Encoded JWT token string.
             token_type (TokenType): Expected type of the token (e.g., access or refresh).
@@ -52,15 +69,22 @@ class TokenService:
             jwt.InvalidTokenError: If the token is invalid or cannot be decoded.
         """
         try:
-            payload = jwt.decode(
-                token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-            )
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = get_keyring().verification_key(kid)
+            if key is None:
+                TOKEN_VALIDATIONS.labels(token_type.value, "unknown_key").inc()
+                return None
+            payload = jwt.decode(token, key, algorithms=[settings.JWT_ALGORITHM])
             if payload.get("type") != token_type.value:
+                TOKEN_VALIDATIONS.labels(token_type.value, "wrong_type").inc()
                 return None
+            TOKEN_VALIDATIONS.labels(token_type.value, "valid").inc()
             return payload
         except jwt.ExpiredSignatureError:
+            TOKEN_VALIDATIONS.labels(token_type.value, "expired").inc()
             return None
         except jwt.InvalidTokenError:
+            TOKEN_VALIDATIONS.labels(token_type.value, "invalid").inc()
             return None
 
     def generate_token_pair(self, user_id: int) -> dict:
@@ -97,9 +121,51 @@ class TokenService:
     def validate_refresh_token(self, token: str) -> Optional[dict]:
         """Validate the refresh token and return its decoded payload if valid.
 
+        Refresh tokens without an ID or with a revoked ID are rejected.
+
         Args:
             token (str): The refresh token to validate.
         Returns:
             Optional[dict]: The decoded payload if the token is valid; otherwise, None.
         """
-        return self.decode_token(token, TokenType.REFRESH)
+        payload = self.decode_token(token, TokenType.REFRESH)
+        if payload is None:
+            return None
+        if not isinstance(payload.get("jti"), str) or revocation_store.is_revoked(
+            payload["jti"]
+        ):
+            TOKEN_VALIDATIONS.labels(TokenType.REFRESH.value, "revoked").inc()
+            return None
+        return payload
+
+    def revoke_refresh_token(self, token: str) -> Optional[dict]:
+        """Revoke a valid refresh token for the rest of its lifetime.
+
+        Args:
+            token (str): The refresh token to revoke.
+        Returns:
+            Optional[dict]: The decoded payload if the token was valid and has been
+                revoked by this call; otherwise, None.
+        """
+        payload = self.validate_refresh_token(token)
+        if payload is None or not revocation_store.revoke(
+            payload["jti"], payload["exp"]
+        ):
+            return None
+        return payload
+
+    def rotate_refresh_token(self, token: str) -> Optional[dict]:
+        """Exchange a refresh token for a new token pair, revoking the old one.
+
+        Each refresh token can be used once, a replayed token is rejected.
+
+        Args:
+            token (str): The refresh token to exchange.
+        Returns:
+            Optional[dict]: The new access and refresh tokens if the token was valid;
+                otherwise, None.
+        """
+        payload = self.revoke_refresh_token(token)
+        if payload is None:
+            return None
+        return self.generate_token_pair(payload["user_id"])
@@ -1,9 +1,11 @@
 from django.urls import path
 
-from tokens_auth.views import LoginView, RefreshTokenView, RegisterView
+from tokens_auth.views import (LoginView, RefreshTokenView, RegisterView,
+                               RevokeTokenView)
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
     path("login/", LoginView.as_view(), name="login"),
     path("refresh-token/", RefreshTokenView.as_view(), name="refresh"),
+    path("revoke-token/", RevokeTokenView.as_view(), name="revoke"),
 ]
@@ -1,9 +1,13 @@
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET
 from rest_framework import status
 from rest_framework.generics import GenericAPIView
 
+from tokens_auth.keys import get_keyring
 from tokens_auth.serializers import (LoginSerializer, RefreshTokenSerializer,
                                      RegisterSerializer)
 from tokens_auth.services import TokenService
@@ -15,6 +19,7 @@ class RegisterView(GenericAPIView):
     """API view for user registration."""
 
     serializer_class = RegisterSerializer
+    query_budget = 4
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
@@ -32,6 +37,7 @@ class LoginView(GenericAPIView):
     """API view for user login."""
 
     serializer_class = LoginSerializer
+    query_budget = 1
 
     def post(self, request):
         username = request.data.get("username")
@@ -48,15 +54,41 @@ class LoginView(GenericAPIView):
 
 
 class RefreshTokenView(GenericAPIView):
-    """API view for refreshing token pair."""
+    """API view for refreshing token pair, each refresh token can be used once."""
 
     serializer_class = RefreshTokenSerializer
+    query_budget = 0
 
     def post(self, request):
         refresh_token = request.data.get("refresh_token")
-        payload = service.validate_refresh_token(refresh_token)
+        new_tokens = service.rotate_refresh_token(refresh_token)
 
-        if payload:
-            new_tokens = service.generate_token_pair(payload["user_id"])
+        if new_tokens:
             return JsonResponse(new_tokens)
         return JsonResponse({"error": "Invalid or expired refresh token"}, status=400)
+
+
+class RevokeTokenView(GenericAPIView):
+    """API view for revoking a refresh token, e.g. on logout."""
+
+    serializer_class = RefreshTokenSerializer
+    query_budget = 0
+
+    def post(self, request):
+        refresh_token = request.data.get("refresh_token")
+        if service.revoke_refresh_token(refresh_token):
+            return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+        return JsonResponse({"error": "Invalid or expired refresh token"}, status=400)
+
+
+@require_GET
+@condition(etag_func=lambda request: get_keyring().jwks_etag)
+def jwks(request):
+    """Publish the public token signing keys as JWK Set.
+
+    The set is built once per key ring and cached by clients for `JWKS_MAX_AGE`
+    seconds, so verifying services fetch it again only after a key rotation.
+    """
+    response = HttpResponse(get_keyring().jwks, content_type="application/json")
+    patch_cache_control(response, public=True, max_age=int(settings.JWKS_MAX_AGE))
+    return response